@@ -49,9 +49,21 @@ __all__ = [
     # interfaces
     'AotModule',
     'ComputeGraph',
+    'DataParallel',
+    'DeviceNdArray',
     'Kernel',
     'KernelArgument',
+    'LaunchArena',
+    'LazyArray',
     'Memory',
+    'MemoryPool',
+    'ModuleCache',
+    'PreparedLaunch',
     'Runtime',
+    'RuntimeCache',
+    'RuntimeExecutor',
+    'RuntimePool',
     'Sampler',
+    'StagingRing',
+    'SubmissionPolicy',
 ]
@@ -0,0 +1,43 @@
+"""Timing of the instrumented operations of the `interfaces` layer.
+
+Call sites take a timestamp with :func:`start_timer`, which is 0 while
+both the metrics and the tracer are disabled, and only report the
+operation if it is not, so disabled instrumentation costs one check.
+"""
+
+from time import perf_counter_ns
+from typing import Optional
+
+from .metrics import metrics
+from .tracing import tracer
+
+
+def start_timer() -> int:
+    """Gets a `perf_counter_ns` timestamp if metrics or tracing are
+    enabled, 0 otherwise."""
+
+    return perf_counter_ns() if metrics.enabled or tracer.enabled else 0
+
+
+def record_launch(name: Optional[str], start_ns: int, **args) -> None:
+    """Records a launch started at `start_ns` in the metrics and the
+    trace."""
+
+    end_ns, name = perf_counter_ns(), name or '<unnamed>'
+
+    if metrics.enabled:
+        metrics.record_launch(name, (end_ns - start_ns) / 1e9)
+    if tracer.enabled:
+        tracer.record(name, 'launch', start_ns, end_ns, **args)
+
+
+def record_transfer(direction: str, nbytes: int, start_ns: int) -> None:
+    """Records a host/device copy started at `start_ns` in the metrics and
+    the trace."""
+
+    end_ns = perf_counter_ns()
+
+    if metrics.enabled:
+        metrics.record_transfer(direction, nbytes, (end_ns - start_ns) / 1e9)
+    if tracer.enabled:
+        tracer.record(direction, 'transfer', start_ns, end_ns, nbytes=nbytes)
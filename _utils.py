@@ -1,13 +1,72 @@
 from ctypes import c_void_p
 
 from .c_api import *
+from .c_api.c_ti_methods import C
+
+
+def set_library_path(library_path: str) -> None:
+    """Sets the Taichi C-API library file or directory to load on the
+    first C call, overriding the default search."""
+
+    C.set_library_path(library_path)
+
+
+def use_simulated_backend(backend=None):
+    """Routes every C call to an in-process simulated backend, a new one
+    unless given, instead of the Taichi C-API library, and returns it.
+
+    Handles created through the previous backend must not be used
+    afterwards."""
+
+    from .c_api.simulated_backend import SimulatedBackend
+
+    if backend is None:
+        backend = SimulatedBackend()
+
+    C.set_backend(backend)
+    return backend
+
+
+def use_native_backend() -> None:
+    """Routes C calls back to the Taichi C-API library."""
+
+    C.set_backend(None)
 
 
 def get_version() -> int:
     return ti_get_version()
 
 
-def get_last_error(message_size: int = 256) -> str:
+# How get_last_error checks for C-API errors:
+# - 'always': fetch the code and message after every wrapped call;
+# - 'debug': query the code only and fetch the message on failure;
+# - 'deferred': skip per-call checks and check once on flush and wait;
+# - 'off': never check.
+ERROR_CHECK_MODES = ('always', 'debug', 'deferred', 'off')
+
+_error_check_mode = 'always'
+
+
+def set_error_check_mode(mode: str) -> None:
+    """Sets the global error-checking mode, see ERROR_CHECK_MODES."""
+
+    global _error_check_mode
+
+    if mode not in ERROR_CHECK_MODES:
+        raise ValueError(f"Unknown error check mode {mode!r}, "
+                         f"expected one of {ERROR_CHECK_MODES}.")
+
+    _error_check_mode = mode
+
+
+def get_error_check_mode(ti_runtime=None) -> str:
+    """Gets the error-checking mode of a runtime, or the global one."""
+
+    mode = getattr(ti_runtime, 'error_check_mode', None)
+    return mode if mode is not None else _error_check_mode
+
+
+def _raise_last_error(message_size: int) -> str:
     error_message, error_code = ti_get_last_error(message_size)
 
     if error_code != 0:
@@ -18,6 +77,29 @@ def get_last_error(message_size: int = 256) -> str:
     return f"{error_message}. Error code: {error_code}."
 
 
+def get_last_error(message_size: int = 256, ti_runtime=None) -> str:
+    """Raises the last C-API error as a RuntimeError, as far as the
+    error-checking mode of `ti_runtime` asks for a check at this point."""
+
+    mode = get_error_check_mode(ti_runtime)
+
+    if mode == 'always':
+        return _raise_last_error(message_size)
+
+    if mode == 'debug' and ti_get_last_error_code() != 0:
+        return _raise_last_error(message_size)
+
+    return ''
+
+
+def check_deferred_errors(ti_runtime=None, message_size: int = 256) -> None:
+    """Checks for C-API errors if the runtime defers its checks to
+    flush and wait."""
+
+    if get_error_check_mode(ti_runtime) == 'deferred':
+        _raise_last_error(message_size)
+
+
 def set_last_error(error: TiError, message: str) -> None:
     ti_set_last_error(error, message)
 
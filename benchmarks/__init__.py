@@ -0,0 +1,346 @@
+"""Benchmarks of the Python binding overhead.
+
+The suite measures kernel launch overhead against argument count and
+type, argument upload and readback throughput against array size and
+dtype, kernel lookup cost and package import time. It runs on the
+in-process simulated C API by default, which isolates the cost of the
+bindings themselves, or on the native library with a real AOT module.
+
+Results are plain JSON documents, which :func:`compare` checks against
+a stored baseline. Run it with `python -m taichiAOT.benchmarks --help`.
+"""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from time import perf_counter
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from taichiAOT.c_api.c_ti_methods import C
+from taichiAOT.interfaces import AotModule, DeviceNdArray, KernelArgument, Runtime
+
+SIMULATED = 'simulated'
+NATIVE = 'native'
+
+LAUNCH_ARGUMENT_COUNTS = (1, 4, 16)
+LAUNCH_ARGUMENT_TYPES = ('i32', 'f32', 'ndarray', 'device_ndarray')
+TRANSFER_SIZES = (1 << 10, 1 << 16, 1 << 20, 1 << 24)
+TRANSFER_DTYPES = ('uint8', 'int32', 'float32', 'float64')
+GROUPS = ('launch', 'upload', 'readback', 'lookup', 'import')
+
+_SIMULATED_KERNEL = 'benchmark'
+
+
+class Regression(NamedTuple):
+    """A benchmark slower than its baseline beyond the threshold."""
+
+    name: str
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        return self.seconds / self.baseline_seconds
+
+
+def parse_signature(spec: str) -> List[object]:
+    """Builds launch arguments from a comma-separated signature such as
+    `ndarray:float32:64x64,f32,i32`."""
+
+    arguments = []
+    for token in filter(None, (token.strip() for token in spec.split(','))):
+        kind, *details = token.split(':')
+        if kind == 'i32':
+            arguments.append(1)
+        elif kind == 'f32':
+            arguments.append(1.0)
+        elif kind == 'ndarray' and len(details) == 2:
+            shape = tuple(int(dim) for dim in details[1].split('x'))
+            arguments.append(np.zeros(shape, dtype=details[0]))
+        else:
+            raise ValueError(f"Cannot parse argument {token!r} of signature {spec!r}.")
+
+    return arguments
+
+
+def _measure(func: Callable, setup: Optional[Callable] = None,
+             after: Optional[Callable] = None, repeat: int = 5,
+             min_time: float = 0.05) -> Dict[str, float]:
+    """Times `func` per call, as the median and best of `repeat` rounds
+    whose call count is doubled until a round takes `min_time`.
+
+    With `setup`, every call gets the result of a fresh untimed `setup()`
+    call. `after` runs untimed after every round."""
+
+    def run(number: int) -> float:
+        if setup is None:
+            start = perf_counter()
+            for _ in range(number):
+                func()
+            elapsed = perf_counter() - start
+        else:
+            elapsed = 0.0
+            for _ in range(number):
+                state = setup()
+                start = perf_counter()
+                func(state)
+                elapsed += perf_counter() - start
+
+        if after is not None:
+            after()
+
+        return elapsed
+
+    number = 1
+    while True:
+        elapsed = run(number)
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+
+        number *= 2
+
+    timings = [elapsed / number] + [run(number) / number for _ in range(repeat - 1)]
+    return {
+        'seconds': statistics.median(timings),
+        'min_seconds': min(timings),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def _launch_arguments(ti_runtime: Runtime, kind: str, count: int) -> List[object]:
+    if kind == 'i32':
+        return [1] * count
+
+    if kind == 'f32':
+        return [1.0] * count
+
+    if kind == 'ndarray':
+        return [np.zeros(256, dtype=np.float32) for _ in range(count)]
+
+    return [DeviceNdArray.empty(ti_runtime, (256,), np.float32) for _ in range(count)]
+
+
+def bench_launch(ti_runtime: Runtime, aot_module: AotModule, kernel_name: str,
+                 signature: Optional[Sequence] = None, **options) -> Dict[str, dict]:
+    """Times `Kernel.launch` and prepared relaunches, sweeping argument
+    counts and types, or with the given `signature` only."""
+
+    kernel = aot_module.get_kernel(kernel_name)
+    cases = {'signature': list(signature)} if signature is not None else {
+        f'{kind}x{count}': _launch_arguments(ti_runtime, kind, count)
+        for kind in LAUNCH_ARGUMENT_TYPES for count in LAUNCH_ARGUMENT_COUNTS}
+
+    results = {}
+    for case, args in cases.items():
+        results[f'launch/{case}'] = _measure(
+            lambda: kernel.launch(ti_runtime, *args), after=ti_runtime.wait, **options)
+
+        prepared_launch = kernel.prepare(ti_runtime, *args)
+        results[f'prepared_launch/{case}'] = _measure(
+            prepared_launch, after=ti_runtime.wait, **options)
+        prepared_launch.release()
+
+    kernel.history.clear()
+    ti_runtime.wait()
+    return results
+
+
+def _transfer_arrays():
+    for dtype in TRANSFER_DTYPES:
+        for size in TRANSFER_SIZES:
+            yield f'{dtype}/{size}', np.ones(size // np.dtype(dtype).itemsize, dtype=dtype)
+
+
+def bench_upload(ti_runtime: Runtime, **options) -> Dict[str, dict]:
+    """Times `KernelArgument` uploads of host arrays."""
+
+    results = {}
+    for case, array in _transfer_arrays():
+        def upload():
+            KernelArgument(ti_runtime, array).release()
+
+        result = _measure(upload, **options)
+        result['bytes_per_second'] = array.nbytes / result['seconds']
+        results[f'upload/{case}'] = result
+
+    return results
+
+
+def bench_readback(ti_runtime: Runtime, aot_module: AotModule, kernel_name: str,
+                   **options) -> Dict[str, dict]:
+    """Times `Kernel.get_arguments` of a launch, including the download
+    of its lazy arrays."""
+
+    kernel = aot_module.get_kernel(kernel_name)
+
+    results = {}
+    for case, array in _transfer_arrays():
+        def read_back(_):
+            for lazy_array in kernel.get_arguments():
+                lazy_array.numpy()
+
+        result = _measure(read_back, setup=lambda: kernel.set_arguments(ti_runtime, array),
+                          after=ti_runtime.wait, **options)
+        result['bytes_per_second'] = array.nbytes / result['seconds']
+        results[f'readback/{case}'] = result
+
+    return results
+
+
+def bench_lookup(aot_module: AotModule, kernel_name: str, **options) -> Dict[str, dict]:
+    """Times memoized and first-time `AotModule.get_kernel` lookups."""
+
+    return {
+        'lookup/get_kernel': _measure(lambda: aot_module.get_kernel(kernel_name), **options),
+        'lookup/get_kernel_uncached': _measure(
+            lambda _: aot_module.get_kernel(kernel_name),
+            setup=aot_module.kernels.clear, **options),
+    }
+
+
+def bench_import(repeat: int = 5, **options) -> Dict[str, dict]:
+    """Times a fresh `import` of the package in a new interpreter."""
+
+    package_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    package_name = __name__.rpartition('.')[0]
+    script = (f"import time; start = time.perf_counter(); import {package_name}; "
+              f"print(time.perf_counter() - start)")
+
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (os.path.dirname(package_directory), environment.get('PYTHONPATH'))))
+
+    timings = [float(subprocess.check_output([sys.executable, '-c', script],
+                                             env=environment))
+               for _ in range(repeat)]
+    return {'import/package': {
+        'seconds': statistics.median(timings),
+        'min_seconds': min(timings),
+        'number': 1,
+        'repeat': repeat,
+    }}
+
+
+def run(backend: str = SIMULATED, module_path: Optional[str] = None,
+        kernel_name: Optional[str] = None, signature: Optional[Sequence] = None,
+        groups: Sequence[str] = GROUPS, repeat: int = 5,
+        min_time: float = 0.05) -> dict:
+    """Runs the benchmark `groups` and returns the results document.
+
+    On the simulated backend a placeholder module and kernel are used.
+    On the native library `module_path` and `kernel_name` are required,
+    and launches use the kernel `signature` instead of the sweep."""
+
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark groups {sorted(unknown)}, expected {GROUPS}.")
+
+    previous_backend, temporary_directory = C.backend, None
+    if backend == SIMULATED:
+        from taichiAOT.c_api.simulated_backend import SimulatedBackend
+
+        C.set_backend(SimulatedBackend())
+        temporary_directory = tempfile.mkdtemp()
+        module_path, kernel_name = temporary_directory, _SIMULATED_KERNEL
+
+    elif backend != NATIVE:
+        raise ValueError(f"Unknown backend {backend!r}, expected {SIMULATED!r} or {NATIVE!r}.")
+
+    elif module_path is None or kernel_name is None:
+        raise ValueError("Benchmarking the native library requires an AOT module and kernel.")
+
+    elif signature is None and 'launch' in groups:
+        raise ValueError("Benchmarking native launches requires the kernel signature.")
+
+    options = {'repeat': repeat, 'min_time': min_time}
+    results = {}
+
+    try:
+        if set(groups) - {'import'}:
+            ti_runtime = Runtime.create()
+            aot_module = AotModule.load(ti_runtime, module_path)
+            try:
+                if 'launch' in groups:
+                    results.update(bench_launch(ti_runtime, aot_module, kernel_name,
+                                                signature, **options))
+                if 'upload' in groups:
+                    results.update(bench_upload(ti_runtime, **options))
+                if 'readback' in groups:
+                    results.update(bench_readback(ti_runtime, aot_module, kernel_name,
+                                                  **options))
+                if 'lookup' in groups:
+                    results.update(bench_lookup(aot_module, kernel_name, **options))
+            finally:
+                aot_module.destroy()
+                ti_runtime.destroy()
+
+        if 'import' in groups:
+            results.update(bench_import(repeat))
+
+    finally:
+        if backend == SIMULATED:
+            C.set_backend(previous_backend)
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+
+    return {
+        'metadata': {
+            'backend': backend,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'benchmarks': results,
+    }
+
+
+def save(results: dict, filepath: str) -> None:
+    with open(filepath, 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+def load(filepath: str) -> dict:
+    with open(filepath) as file:
+        return json.load(file)
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.1) -> List[Regression]:
+    """Lists the benchmarks of `results` whose median time exceeds that of
+    `baseline` by more than `threshold`, a fraction of the baseline.
+    Benchmarks missing from either document are skipped."""
+
+    regressions = []
+    for name, result in results['benchmarks'].items():
+        reference = baseline['benchmarks'].get(name)
+        if reference is not None and result['seconds'] > reference['seconds'] * (1.0 + threshold):
+            regressions.append(Regression(name, reference['seconds'], result['seconds']))
+
+    return regressions
+
+
+def format_results(results: dict, baseline: Optional[dict] = None) -> str:
+    """Renders the results as a text table, with the change against the
+    baseline if given."""
+
+    lines = []
+    for name, result in sorted(results['benchmarks'].items()):
+        line = f"{name:<40} {result['seconds'] * 1e6:>12.3f} us"
+        if 'bytes_per_second' in result:
+            line += f" {result['bytes_per_second'] / (1 << 20):>12.1f} MiB/s"
+
+        reference = (baseline or {}).get('benchmarks', {}).get(name)
+        if reference is not None:
+            line += f" {(result['seconds'] / reference['seconds'] - 1.0) * 100:>+8.1f}%"
+
+        lines.append(line)
+
+    return '\n'.join(lines)
@@ -0,0 +1,57 @@
+import argparse
+import sys
+
+from taichiAOT._utils import set_library_path
+from . import (GROUPS, NATIVE, SIMULATED, compare, format_results, load,
+               parse_signature, run, save)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m taichiAOT.benchmarks',
+        description='Benchmarks the overhead of the Taichi AOT Python bindings.')
+    parser.add_argument('--backend', choices=(SIMULATED, NATIVE), default=SIMULATED,
+                        help='simulated C API (default) or the native library')
+    parser.add_argument('--library', help='native library file or directory')
+    parser.add_argument('--module', help='AOT module to load on the native library')
+    parser.add_argument('--kernel', help='kernel of the module to benchmark')
+    parser.add_argument('--signature',
+                        help='kernel arguments, e.g. ndarray:float32:64x64,f32,i32')
+    parser.add_argument('--groups', default=','.join(GROUPS),
+                        help=f'comma-separated subset of {",".join(GROUPS)}')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='minimum seconds per timing round')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed slowdown over the baseline, as a fraction')
+    args = parser.parse_args(argv)
+
+    if args.library:
+        set_library_path(args.library)
+
+    results = run(args.backend, args.module, args.kernel,
+                  parse_signature(args.signature) if args.signature else None,
+                  [group.strip() for group in args.groups.split(',') if group.strip()],
+                  args.repeat, args.min_time)
+
+    if args.output:
+        save(results, args.output)
+
+    baseline = load(args.baseline) if args.baseline else None
+    print(format_results(results, baseline))
+
+    if baseline is None:
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression.name}: {regression.baseline_seconds * 1e6:.3f} us -> "
+              f"{regression.seconds * 1e6:.3f} us ({regression.ratio:.2f}x)", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -29,7 +29,7 @@ __all__ = [
 
     # methods
     'ti_get_version', 'ti_get_available_archs',
-    'ti_get_last_error', 'ti_set_last_error',
+    'ti_get_last_error', 'ti_get_last_error_code', 'ti_set_last_error',
     'ti_create_runtime', 'ti_destroy_runtime',
     'ti_set_runtime_capabilities_ext', 'ti_get_runtime_capabilities',
     'ti_load_aot_module', 'ti_create_aot_module', 'ti_destroy_aot_module',
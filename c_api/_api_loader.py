@@ -1,6 +1,8 @@
 import os
 import sys
 from ctypes import CDLL
+from threading import Lock
+from time import perf_counter_ns
 
 from ._bindings import TAICHI_C_API_METHODS
 from .exceptions import *
@@ -14,31 +16,188 @@ class C_API(object):
 
     _native_supported_platforms = ['linux', 'linux2', 'darwin', 'win32']
 
-    def __init__(self, supported_platforms=None) -> None:
+    # Environment variable overriding the library search, either the
+    # library file itself or the directory containing it.
+    LIBRARY_PATH_ENV = 'TAICHI_C_API_PATH'
+
+    # Environment variable selecting a backend other than the native
+    # library; 'simulated' picks the in-process SimulatedBackend.
+    BACKEND_ENV = 'TAICHI_C_API_BACKEND'
+
+    def __init__(self, supported_platforms=None, library_path=None,
+                 lazy=True, backend=None) -> None:
         if supported_platforms is None:
             supported_platforms = []
 
         self._supported_platforms = supported_platforms
+        self._library_path = library_path
         self._loaded = False
         self._cdll = None
+        self._backend = backend
+        self._backend_from_env = backend is None
+        self._lock = Lock()
+        self._call_hooks = []
 
-        self._initialize()
+        if not lazy:
+            self._initialize()
+            self._load_taichi_c_api()
 
     def __getattr__(self, name):
-        if name.startswith('__') and name.endswith('__'):
+        if name.startswith('_') or name not in TAICHI_C_API_METHODS:
             raise TaichiMethodNotFound(f"{name} method not found.")
 
-        func = self.__getitem__(name)
+        if not self._loaded:
+            self._initialize()
+
+        func = self._wrap(name, self._bind(name))
         setattr(self, name, func)
 
         return func
 
+    def add_call_hook(self, hook) -> None:
+        """Calls `hook(method_name, start_ns, end_ns)` after every C call.
+
+        Without hooks the raw foreign functions are called, so they cost
+        nothing when unused.
+
+        :return: None
+        """
+
+        if hook not in self._call_hooks:
+            self._call_hooks.append(hook)
+            self._rebind()
+
+    def remove_call_hook(self, hook) -> None:
+        """Stops calling a hook added by :meth:`add_call_hook`.
+
+        :return: None
+        """
+
+        if hook in self._call_hooks:
+            self._call_hooks.remove(hook)
+            self._rebind()
+
+    def _wrap(self, method_name: str, f):
+        """Wrap a foreign function to report its timing to the call hooks
+
+        :return: the foreign function itself if there are no hooks
+        """
+
+        if not self._call_hooks:
+            return f
+
+        hooks = tuple(self._call_hooks)
+
+        def call(*args):
+            start = perf_counter_ns()
+            try:
+                return f(*args)
+            finally:
+                end = perf_counter_ns()
+                for hook in hooks:
+                    hook(method_name, start, end)
+
+        return call
+
+    def _rebind(self) -> None:
+        """Rebind the already bound methods after the hooks changed
+
+        :return: None
+        """
+
+        for method_name in TAICHI_C_API_METHODS:
+            if method_name in self.__dict__:
+                setattr(self, method_name,
+                        self._wrap(method_name, self._bind(method_name)))
+
+    def set_library_path(self, library_path: str) -> None:
+        """Sets the library file or directory to load the C API from.
+
+        :return: None
+        """
+
+        if self._loaded:
+            raise TaichiException('Taichi C API is already loaded')
+
+        self._library_path = library_path
+
+    def set_backend(self, backend) -> None:
+        """Routes every C call to `backend` instead of the native library,
+        or back to the library if `backend` is None.
+
+        A backend provides `bind(method_name)` returning a callable for
+        each method of the method map, see :class:`SimulatedBackend`.
+        Methods already bound are dropped and rebound on next use.
+
+        :return: None
+        """
+
+        with self._lock:
+            for method_name in TAICHI_C_API_METHODS:
+                self.__dict__.pop(method_name, None)
+
+            self._backend = backend
+            self._backend_from_env = False
+            self._cdll = None
+            self._loaded = False
+
+    @property
+    def backend(self):
+        """The backend C calls are routed to, None for the native library
+
+        :return: the backend object or None
+        """
+
+        return self._backend
+
+    def _find_library(self, library_file_name: str) -> str:
+        """Resolve the library path, trying an explicit path, the
+        environment override, the working directory and the package
+        directory in that order.
+
+        :return: str
+        """
+
+        override = self._library_path or os.environ.get(C_API.LIBRARY_PATH_ENV)
+        if override:
+            if os.path.isdir(override):
+                override = os.path.join(override, library_file_name)
+
+            if os.path.isfile(override):
+                return override
+
+            raise MissingTaichiLibraryException(
+                f'Missing library {override}')
+
+        if os.path.isfile(os.path.join(os.getcwd(), library_file_name)):
+            return os.path.join(os.getcwd(), library_file_name)
+
+        elif os.path.isfile(
+                os.path.join(os.path.dirname(__file__), library_file_name)):
+            return os.path.join(os.path.dirname(__file__),
+                                library_file_name)
+
+        raise MissingTaichiLibraryException(
+            f'Missing library {library_file_name}')
+
     def _initialize(self) -> bool:
-        """Initialize module by loading C API library
+        """Initialize module by loading C API library. Methods are bound
+        on first use.
 
         :return: bool
         """
 
+        if self._backend_from_env and os.environ.get(C_API.BACKEND_ENV) == 'simulated':
+            from .simulated_backend import SimulatedBackend
+            self._backend = SimulatedBackend()
+
+        if self._backend is not None:
+            with self._lock:
+                self._cdll = self._backend
+                self._loaded = True
+
+            return self._loaded
+
         platform = sys.platform
 
         if (self._supported_platforms and
@@ -64,23 +223,33 @@ class C_API(object):
             raise UnsupportedPlatformException(
                 f'"{platform}" is not being supported')
 
-        if os.path.isfile(os.path.join(os.getcwd(), library_file_name)):
-            library_path = os.path.join(os.getcwd(), library_file_name)
+        with self._lock:
+            if not self._loaded:
+                self._cdll = CDLL(self._find_library(library_file_name))
+                self._loaded = True
 
-        elif os.path.isfile(
-                os.path.join(os.path.dirname(__file__), library_file_name)):
-            library_path = os.path.join(os.path.dirname(__file__),
-                                        library_file_name)
+        return self._loaded
 
-        else:
-            raise MissingTaichiLibraryException(
-                f'Missing library {library_file_name}')
+    def _bind(self, method_name: str):
+        """Look up a method of the loaded library and assign its
+        arg/res types based on method map
 
-        self._cdll = CDLL(library_path)
-        self._loaded = True
+        :return: the bound foreign function
+        """
 
-        self._load_taichi_c_api()
-        return self._loaded
+        if self._backend is not None:
+            return self._backend.bind(method_name)
+
+        f = getattr(self._cdll, method_name)
+        attributes = TAICHI_C_API_METHODS[method_name]
+
+        if 'restype' in attributes:
+            f.restype = attributes['restype']
+
+        if 'argtypes' in attributes:
+            f.argtypes = attributes['argtypes']
+
+        return f
 
     def _load_taichi_c_api(self) -> None:
         """Load all methods from taichi api and assign their correct arg/res
@@ -92,16 +261,9 @@ class C_API(object):
         if not self._loaded:
             raise TaichiNotLoadedException('Taichi C API not yet loaded')
 
-        for method_name, attributes in TAICHI_C_API_METHODS.items():
-            f = getattr(self._cdll, method_name)
-
-            if 'restype' in attributes:
-                f.restype = attributes['restype']
-
-            if 'argtypes' in attributes:
-                f.argtypes = attributes['argtypes']
-
-            setattr(self, method_name, f)
+        for method_name in TAICHI_C_API_METHODS:
+            setattr(self, method_name,
+                    self._wrap(method_name, self._bind(method_name)))
 
     @property
     def loaded(self) -> bool:
@@ -6,8 +6,8 @@ from ._api_loader import C_API
 from .c_ti_enums import *
 from .c_ti_structs import *
 
+# The library is loaded on the first C call, see C_API.__getattr__.
 C = C_API()
-assert C.loaded
 
 TI_FALSE = 0
 TI_TRUE = 1
@@ -65,6 +65,14 @@ def ti_get_last_error(message_size: int) -> tuple[str, int]:
     return error_message, error_code
 
 
+def ti_get_last_error_code() -> int:
+    """Gets the code of the last error raised by Taichi C-API invocations
+    without fetching its message."""
+
+    size = c_uint64(0)
+    return C.ti_get_last_error(byref(size), None)
+
+
 def ti_set_last_error(error: TiError, message: str) -> None:
     """Sets the provided error as the last error raised by Taichi C-API
     invocations.
@@ -214,11 +222,14 @@ def ti_launch_kernel(runtime: TiRuntime,
     """Launches a Taichi kernel with the provided arguments.
 
     The arguments **must** have the same count and types in the same order
-    as in the source code.
+    as in the source code. A prebuilt `TiArgument` array is passed through
+    without copying.
     """
 
-    C.ti_launch_kernel(runtime, kernel, num_args,
-                       (TiArgument * num_args)(*args))
+    if not isinstance(args, Array):
+        args = (TiArgument * num_args)(*args)
+
+    C.ti_launch_kernel(runtime, kernel, num_args, args)
 
 
 def ti_launch_compute_graph(runtime: TiRuntime, graph: TiComputeGraph,
@@ -227,11 +238,13 @@ def ti_launch_compute_graph(runtime: TiRuntime, graph: TiComputeGraph,
     """Launches a Taichi compute graph with provided named arguments.
 
     The named arguments **must** have the same count, names, and types
-    as in the source code."""
+    as in the source code. A prebuilt `TiNamedArgument` array is passed
+    through without copying."""
+
+    if not isinstance(named_args, Array):
+        named_args = (TiNamedArgument * num_args)(*named_args)
 
-    C.ti_launch_compute_graph(runtime, graph, num_args,
-                              (TiNamedArgument * num_args)(
-                                  *named_args))
+    C.ti_launch_compute_graph(runtime, graph, num_args, named_args)
 
 
 def ti_flush(runtime: TiRuntime) -> None:
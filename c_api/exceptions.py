@@ -14,5 +14,5 @@ class TaichiNotLoadedException(TaichiException):
     pass
 
 
-class TaichiMethodNotFound(TaichiException):
+class TaichiMethodNotFound(TaichiException, AttributeError):
     pass
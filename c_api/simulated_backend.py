@@ -0,0 +1,422 @@
+import os
+import threading
+from collections import deque
+from ctypes import cast, c_void_p, memmove
+from itertools import count
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .c_ti_enums import *
+from .c_ti_handles import *
+from .c_ti_structs import *
+
+_NDARRAY_DTYPES = {
+    TiDataType.TI_DATA_TYPE_F16: np.float16,
+    TiDataType.TI_DATA_TYPE_F32: np.float32,
+    TiDataType.TI_DATA_TYPE_F64: np.float64,
+    TiDataType.TI_DATA_TYPE_I8: np.int8,
+    TiDataType.TI_DATA_TYPE_I16: np.int16,
+    TiDataType.TI_DATA_TYPE_I32: np.int32,
+    TiDataType.TI_DATA_TYPE_I64: np.int64,
+    TiDataType.TI_DATA_TYPE_U8: np.uint8,
+    TiDataType.TI_DATA_TYPE_U16: np.uint16,
+    TiDataType.TI_DATA_TYPE_U32: np.uint32,
+    TiDataType.TI_DATA_TYPE_U64: np.uint64,
+}
+
+
+def _address(handle) -> int:
+    if handle is None:
+        return 0
+
+    if isinstance(handle, int):
+        return handle
+
+    return cast(handle, c_void_p).value or 0
+
+
+def _handle(handle_type, address: int):
+    return cast(c_void_p(address), handle_type)
+
+
+def _deref(reference):
+    """Gets the structure behind a `byref` reference or a pointer."""
+
+    if hasattr(reference, '_obj'):
+        return reference._obj
+
+    if hasattr(reference, 'contents'):
+        return reference.contents
+
+    return reference
+
+
+def _spin(seconds: float) -> None:
+    # Busy-waits, since sleeping cannot resolve microsecond latencies.
+    deadline = perf_counter() + seconds
+    while perf_counter() < deadline:
+        pass
+
+
+class _SimulatedError(Exception):
+    def __init__(self, error: TiError, message: str):
+        super().__init__(message)
+        self.error: TiError = error
+
+
+class LaunchRecord(NamedTuple):
+    """A kernel or compute graph launch seen by the simulated backend.
+    ND-array arguments are recorded as their `(shape, dtype)`."""
+
+    name: str
+    arguments: Tuple[Any, ...]
+
+
+class _SimulatedMemory:
+    def __init__(self, runtime: int, allocate_info: TiMemoryAllocateInfo):
+        self.runtime: int = runtime
+        self.size: int = allocate_info.size
+        self.data: np.ndarray = np.zeros(max(self.size, 1), dtype=np.uint8)
+
+
+class SimulatedBackend:
+    """A stand-in for the Taichi C-API library, implemented on host memory.
+
+    It implements every function of the C-API method map, so the bindings
+    run unchanged without `libtaichi_c_api`, e.g. to benchmark and
+    regression-test argument marshaling on CPU-only machines. Memory is
+    backed by NumPy arrays, launches are recorded and run the Python
+    implementation registered for the kernel or compute graph name, if
+    any, and each function can be given a simulated latency.
+
+    Plug it in with :meth:`C_API.set_backend`.
+    """
+
+    def __init__(self, latency: Optional[Dict[str, float]] = None,
+                 archs: Tuple[TiArch, ...] = (TiArch.TI_ARCH_VULKAN, TiArch.TI_ARCH_X64),
+                 launch_history: int = 1024):
+        self.latency: Dict[str, float] = dict(latency or {})
+        self.archs: Tuple[TiArch, ...] = tuple(archs)
+        self.launches: Deque[LaunchRecord] = deque(maxlen=launch_history)
+        self.launch_count: int = 0
+
+        self._lock = Lock()
+        self._addresses = count(0x1000, 0x10)
+        self._errors = threading.local()
+        self._runtimes: Dict[int, Dict[int, int]] = {}
+        self._memories: Dict[int, _SimulatedMemory] = {}
+        self._modules: Dict[int, Dict[Tuple[int, bytes], int]] = {}
+        self._kernels: Dict[int, str] = {}
+        self._compute_graphs: Dict[int, str] = {}
+        self._handles: Dict[int, Any] = {}
+        self._kernel_functions: Dict[str, Callable] = {}
+        self._compute_graph_functions: Dict[str, Callable] = {}
+
+    def bind(self, method_name: str) -> Callable:
+        """Gets the simulated C function `method_name`, which applies the
+        latency configured for it at call time."""
+
+        f = getattr(self, method_name)
+        latency = self.latency
+
+        def call(*args):
+            seconds = latency.get(method_name)
+            if seconds:
+                _spin(seconds)
+
+            return f(*args)
+
+        return call
+
+    def set_latency(self, method_name: str, seconds: float) -> None:
+        """Sets the time every call of a C function takes."""
+
+        self.latency[method_name] = seconds
+
+    def register_kernel(self, kernel_name: str, func: Callable) -> None:
+        """Runs `func` on every launch of the kernel named `kernel_name`.
+
+        ND-array arguments are passed as NumPy views of the simulated
+        memory, which `func` may modify in place, and scalars as Python
+        numbers."""
+
+        self._kernel_functions[kernel_name] = func
+
+    def register_compute_graph(self, graph_name: str, func: Callable) -> None:
+        """Runs `func` on every launch of the compute graph named
+        `graph_name`, with the named arguments as keyword arguments."""
+
+        self._compute_graph_functions[graph_name] = func
+
+    def memory_array(self, memory) -> np.ndarray:
+        """Gets the bytes backing a simulated memory allocation."""
+
+        return self._memories[_address(memory)].data
+
+    def _fail(self, error: TiError, message: str):
+        self._errors.last = (int(error), message)
+        return None
+
+    def _new_address(self) -> int:
+        with self._lock:
+            return next(self._addresses)
+
+    # Versions and errors
+
+    def ti_get_version(self) -> int:
+        return 10600
+
+    def ti_get_available_archs(self, arch_count, archs) -> None:
+        arch_count = _deref(arch_count)
+        if archs is not None:
+            for index, arch in enumerate(self.archs[:arch_count.value]):
+                archs[index] = arch
+
+        arch_count.value = len(self.archs)
+
+    def ti_get_last_error(self, message_size, message) -> TiError:
+        """Gets the last error of the calling thread, which is kept until
+        :meth:`ti_set_last_error` replaces it, as in the C API."""
+
+        error, text = getattr(self._errors, 'last', (0, ''))
+        size = _deref(message_size)
+
+        if message is not None and size.value:
+            encoded = text.encode('utf-8')[:size.value - 1]
+            memmove(message, encoded + b'\0', len(encoded) + 1)
+            size.value = len(encoded)
+
+        return TiError(error)
+
+    def ti_set_last_error(self, error, message) -> None:
+        self._errors.last = (int(error), (message or b'').decode('utf-8'))
+
+    # Runtimes
+
+    def ti_create_runtime(self, arch, device_index):
+        if arch not in self.archs:
+            return self._fail(TiError.TI_ERROR_NOT_SUPPORTED,
+                              f"arch {arch} is not simulated")
+
+        address = self._new_address()
+        self._runtimes[address] = {}
+        return _handle(TiRuntime, address)
+
+    def ti_destroy_runtime(self, runtime) -> None:
+        address = _address(runtime)
+        with self._lock:
+            self._runtimes.pop(address, None)
+            for memory in [memory for memory, allocation in self._memories.items()
+                           if allocation.runtime == address]:
+                del self._memories[memory]
+
+    def ti_set_runtime_capabilities_ext(self, runtime, capability_count, capabilities) -> None:
+        self._runtimes[_address(runtime)] = {
+            capabilities[index].capability: capabilities[index].level
+            for index in range(capability_count)}
+
+    def ti_get_runtime_capabilities(self, runtime, capability_count, capabilities) -> None:
+        levels = self._runtimes.get(_address(runtime), {})
+        capability_count = _deref(capability_count)
+        if capabilities is not None:
+            for index, (capability, level) in enumerate(list(levels.items())[:capability_count.value]):
+                capabilities[index] = TiCapabilityLevelInfo(capability=capability, level=level)
+
+        capability_count.value = len(levels)
+
+    # Memory
+
+    def ti_allocate_memory(self, runtime, allocate_info):
+        address = self._new_address()
+        allocation = _SimulatedMemory(_address(runtime), _deref(allocate_info))
+        with self._lock:
+            self._memories[address] = allocation
+
+        return _handle(TiMemory, address)
+
+    def ti_free_memory(self, runtime, memory) -> None:
+        with self._lock:
+            if self._memories.pop(_address(memory), None) is None:
+                self._fail(TiError.TI_ERROR_INVALID_ARGUMENT, "memory was not allocated")
+
+    def ti_map_memory(self, runtime, memory) -> Optional[int]:
+        allocation = self._memories.get(_address(memory))
+        if allocation is None:
+            return self._fail(TiError.TI_ERROR_INVALID_ARGUMENT, "memory was not allocated")
+
+        return allocation.data.ctypes.data
+
+    def ti_unmap_memory(self, runtime, memory) -> None:
+        pass
+
+    def ti_copy_memory_device_to_device(self, runtime, src, dst) -> None:
+        src, dst = _deref(src), _deref(dst)
+        source = self._memories.get(_address(src.memory))
+        destination = self._memories.get(_address(dst.memory))
+        if source is None or destination is None:
+            self._fail(TiError.TI_ERROR_INVALID_ARGUMENT, "memory was not allocated")
+            return
+
+        if src.offset + src.size > source.size or dst.offset + src.size > destination.size:
+            self._fail(TiError.TI_ERROR_ARGUMENT_OUT_OF_RANGE, "memory slice out of range")
+            return
+
+        destination.data[dst.offset:dst.offset + src.size] = \
+            source.data[src.offset:src.offset + src.size]
+
+    # Images and samplers are plain handles without contents.
+
+    def ti_allocate_image(self, runtime, allocate_info):
+        address = self._new_address()
+        self._handles[address] = _deref(allocate_info)
+        return _handle(TiImage, address)
+
+    def ti_free_image(self, runtime, image) -> None:
+        self._handles.pop(_address(image), None)
+
+    def ti_create_sampler(self, runtime, create_info):
+        address = self._new_address()
+        self._handles[address] = _deref(create_info)
+        return _handle(TiSampler, address)
+
+    def ti_destroy_sampler(self, runtime, sampler) -> None:
+        self._handles.pop(_address(sampler), None)
+
+    def ti_copy_image_device_to_device(self, runtime, src, dst) -> None:
+        pass
+
+    def ti_track_image_ext(self, runtime, image, layout) -> None:
+        pass
+
+    def ti_transition_image(self, runtime, image, layout) -> None:
+        pass
+
+    # Modules
+
+    def ti_load_aot_module(self, runtime, module_path):
+        if not os.path.exists(module_path.decode('utf-8')):
+            return self._fail(TiError.TI_ERROR_CORRUPTED_DATA,
+                              f"no AOT module at {module_path.decode('utf-8')}")
+
+        address = self._new_address()
+        self._modules[address] = {}
+        return _handle(TiAotModule, address)
+
+    def ti_create_aot_module(self, runtime, tcm, size):
+        if not _address(tcm) or not size:
+            return self._fail(TiError.TI_ERROR_ARGUMENT_NULL, "empty TCM data")
+
+        address = self._new_address()
+        self._modules[address] = {}
+        return _handle(TiAotModule, address)
+
+    def ti_destroy_aot_module(self, aot_module) -> None:
+        for handle in self._modules.pop(_address(aot_module), {}).values():
+            self._kernels.pop(handle, None)
+            self._compute_graphs.pop(handle, None)
+
+    def _get_module_handle(self, aot_module, name: bytes, handles: Dict[int, str]) -> int:
+        module = self._modules.get(_address(aot_module))
+        if module is None:
+            self._fail(TiError.TI_ERROR_INVALID_ARGUMENT, "AOT module was not loaded")
+            return 0
+
+        key = (id(handles), name)
+        address = module.get(key)
+        if address is None:
+            address = module[key] = self._new_address()
+            handles[address] = name.decode('utf-8')
+
+        return address
+
+    def ti_get_aot_module_kernel(self, aot_module, name):
+        return _handle(TiKernel, self._get_module_handle(aot_module, name, self._kernels))
+
+    def ti_get_aot_module_compute_graph(self, aot_module, name):
+        return _handle(TiComputeGraph,
+                       self._get_module_handle(aot_module, name, self._compute_graphs))
+
+    # Launches
+
+    def _argument(self, argument: TiArgument):
+        if argument.type == TiArgumentType.TI_ARGUMENT_TYPE_I32:
+            return argument.value.i32
+
+        if argument.type == TiArgumentType.TI_ARGUMENT_TYPE_F32:
+            return argument.value.f32
+
+        if argument.type == TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY:
+            ndarray = argument.value.ndarray
+            allocation = self._memories.get(_address(ndarray.memory))
+            dtype = _NDARRAY_DTYPES.get(ndarray.elem_type)
+            if allocation is None or dtype is None:
+                raise _SimulatedError(TiError.TI_ERROR_INVALID_ARGUMENT,
+                                      "ndarray memory or element type is invalid")
+
+            shape = tuple(ndarray.shape.dims[:ndarray.shape.dim_count])
+            nbytes = int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+            if nbytes > allocation.size:
+                raise _SimulatedError(TiError.TI_ERROR_ARGUMENT_OUT_OF_RANGE,
+                                      "ndarray exceeds its memory")
+
+            return allocation.data[:nbytes].view(dtype).reshape(shape)
+
+        return argument.value
+
+    @staticmethod
+    def _record(value):
+        if isinstance(value, np.ndarray):
+            return value.shape, value.dtype
+
+        return value
+
+    def _launch(self, name: str, arguments: Tuple[Any, ...],
+                kwargs: Optional[Dict[str, Any]], func: Optional[Callable]) -> None:
+        recorded = tuple(self._record(value) for value in arguments) if kwargs is None \
+            else tuple((key, self._record(value)) for key, value in kwargs.items())
+        self.launches.append(LaunchRecord(name, recorded))
+        self.launch_count += 1
+
+        if func is not None:
+            if kwargs is None:
+                func(*arguments)
+            else:
+                func(**kwargs)
+
+    def ti_launch_kernel(self, runtime, kernel, arg_count, args) -> None:
+        name = self._kernels.get(_address(kernel))
+        if name is None:
+            self._fail(TiError.TI_ERROR_INVALID_ARGUMENT, "kernel was not fetched")
+            return
+
+        try:
+            arguments = tuple(self._argument(args[index]) for index in range(arg_count))
+        except _SimulatedError as error:
+            self._fail(error.error, str(error))
+            return
+
+        self._launch(name, arguments, None, self._kernel_functions.get(name))
+
+    def ti_launch_compute_graph(self, runtime, compute_graph, arg_count, args) -> None:
+        name = self._compute_graphs.get(_address(compute_graph))
+        if name is None:
+            self._fail(TiError.TI_ERROR_INVALID_ARGUMENT, "compute graph was not fetched")
+            return
+
+        try:
+            kwargs = {args[index].name.decode('utf-8'): self._argument(args[index].argument)
+                      for index in range(arg_count)}
+        except _SimulatedError as error:
+            self._fail(error.error, str(error))
+            return
+
+        self._launch(name, (), kwargs, self._compute_graph_functions.get(name))
+
+    def ti_flush(self, runtime) -> None:
+        pass
+
+    def ti_wait(self, runtime) -> None:
+        pass
@@ -1,17 +1,41 @@
 from .aot_module import AotModule
 from .compute_graph import ComputeGraph
+from .data_parallel import DataParallel
+from .device_ndarray import DeviceNdArray
 from .kernel import Kernel
 from .kernel_argument import KernelArgument
+from .launch_arena import LaunchArena
+from .lazy_array import LazyArray
 from .memory import Memory
+from .memory_pool import MemoryPool
+from .module_cache import ModuleCache
+from .prepared_launch import PreparedLaunch
 from .runtime import Runtime
+from .runtime_cache import RuntimeCache
+from .runtime_executor import RuntimeExecutor
+from .runtime_pool import RuntimePool
 from .sampler import Sampler
+from .staging_ring import StagingRing
+from .submission_policy import SubmissionPolicy
 
 __all__ = [
     'AotModule',
     'ComputeGraph',
+    'DataParallel',
+    'DeviceNdArray',
     'Kernel',
     'KernelArgument',
+    'LaunchArena',
+    'LazyArray',
     'Memory',
+    'MemoryPool',
+    'ModuleCache',
+    'PreparedLaunch',
     'Runtime',
-    'Sampler'
+    'RuntimeCache',
+    'RuntimeExecutor',
+    'RuntimePool',
+    'Sampler',
+    'StagingRing',
+    'SubmissionPolicy'
 ]
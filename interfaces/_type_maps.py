@@ -4,6 +4,8 @@ from ctypes import (c_int8, c_int16, c_int32, c_int64, c_uint8, c_uint16,
 from numpy import dtype, ndarray
 
 from taichiAOT import TiArgumentType, TiDataType
+from .device_ndarray import DeviceNdArray
+from .lazy_array import LazyArray
 
 
 class _TiTypeMap:
@@ -11,6 +13,8 @@ class _TiTypeMap:
         int: TiArgumentType.TI_ARGUMENT_TYPE_I32,
         float: TiArgumentType.TI_ARGUMENT_TYPE_F32,
         ndarray: TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY,
+        DeviceNdArray: TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY,
+        LazyArray: TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY,
         bytes: TiArgumentType.TI_ARGUMENT_TYPE_TEXTURE,
         str: TiArgumentType.TI_ARGUMENT_TYPE_SCALAR,
         list: TiArgumentType.TI_ARGUMENT_TYPE_TENSOR,
@@ -48,7 +52,9 @@ ctypes_data_type = {
     dtype('uint16'): c_uint16,
     dtype('uint32'): c_uint32,
     dtype('uint64'): c_uint64,
-    dtype('float16'): c_float,
+    # ctypes has no half-precision type, so f16 elements are carried as
+    # their raw 16 bits.
+    dtype('float16'): c_uint16,
     dtype('float32'): c_float,
     dtype('float64'): c_double
 }
@@ -1,4 +1,12 @@
+import json
+import mmap
+import os
+import zipfile
+from collections.abc import Mapping
 from ctypes import c_void_p
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
 
 from taichiAOT._utils import *
 
@@ -7,48 +15,244 @@ from .kernel import Kernel
 from .runtime import Runtime
 
 
+def _names(entries) -> List[str]:
+    if isinstance(entries, dict):
+        return list(entries)
+
+    if isinstance(entries, list):
+        return [entry['name'] if isinstance(entry, dict) else entry
+                for entry in entries]
+
+    return []
+
+
+def read_module_index(filepath: str) -> Tuple[List[str], List[str]]:
+    """Lists the kernel and compute graph names of an AOT module directory
+    or `.tcm` archive from its `metadata.json` and `graphs.json`.
+
+    Returns empty lists for whatever cannot be found."""
+
+    def read_json(name: str):
+        if os.path.isdir(filepath):
+            path = os.path.join(filepath, name)
+            if os.path.isfile(path):
+                with open(path, 'rb') as file:
+                    return json.load(file)
+
+        elif zipfile.is_zipfile(filepath):
+            with zipfile.ZipFile(filepath) as archive:
+                if name in archive.namelist():
+                    return json.loads(archive.read(name))
+
+        return None
+
+    try:
+        metadata = read_json('metadata.json') or {}
+        graphs = read_json('graphs.json') or {}
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return [], []
+
+    kernel_names = _names(metadata.get('kernels')) if isinstance(metadata, dict) else []
+    graph_names = _names(graphs.get('graphs', graphs)) if isinstance(graphs, dict) else _names(graphs)
+
+    return kernel_names, graph_names
+
+
+class _HandleIndex(Mapping):
+    """A name-to-object mapping that resolves and memoizes the raw handles
+    on access.
+
+    Only the handles are shared; every lookup wraps the handle in a new
+    object, so callers do not share per-object state like a kernel's
+    launch history."""
+
+    def __init__(self, names: Iterable[str], resolve: Callable, wrap: Callable):
+        self._names: List[str] = list(names)
+        self._resolve = resolve
+        self._wrap = wrap
+        self._cache: Dict[str, object] = {}
+
+    def resolve(self, name: str):
+        """Wraps the handle of `name`, fetching it on the first lookup."""
+
+        handle = self._cache.get(name)
+        if handle is None:
+            handle = self._resolve(name)
+
+            self._cache[name] = handle
+            if name not in self._names:
+                self._names.append(name)
+
+        return self._wrap(handle, name=name)
+
+    def __getitem__(self, name: str):
+        try:
+            return self.resolve(name)
+        except RuntimeError as error:
+            raise KeyError(name) from error
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name) -> bool:
+        return name in self._cache or name in self._names
+
+    def extend(self, names: Iterable[str]) -> None:
+        self._names.extend(name for name in names if name not in self._names)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def preload(self) -> None:
+        for name in list(self._names):
+            self.resolve(name)
+
+
 class AotModule:
-    def __init__(self, aot_module_instance: TiAotModule):
+    def __init__(self, aot_module_instance: TiAotModule,
+                 kernel_names: Iterable[str] = (),
+                 graph_names: Iterable[str] = (),
+                 ti_runtime: Optional[Runtime] = None):
         self._aot_module: TiAotModule = aot_module_instance
+        self.runtime: Optional[Runtime] = ti_runtime
+        self._kernels = _HandleIndex(kernel_names, self._fetch_kernel, Kernel)
+        self._compute_graphs = _HandleIndex(graph_names, self._fetch_compute_graph,
+                                            ComputeGraph)
+        self._cache = None
 
     @staticmethod
     def load(ti_runtime: Runtime,
-             filepath: str) -> 'AotModule':
-        """Load an AOT module from a file on the TiRuntime."""
+             filepath: str,
+             preload: bool = False) -> 'AotModule':
+        """Load an AOT module from a file on the TiRuntime.
+
+        The kernels and compute graphs listed in the module are indexed,
+        and with `preload` their handles are fetched right away."""
 
         aot_module_instance = ti_load_aot_module(ti_runtime.runtime_instance, filepath)
 
-        get_last_error()
-        return AotModule(aot_module_instance)
+        get_last_error(ti_runtime=ti_runtime)
+        aot_module = AotModule(aot_module_instance, *read_module_index(filepath),
+                               ti_runtime=ti_runtime)
+        if preload:
+            aot_module.preload()
+
+        return aot_module
+
+    @staticmethod
+    def load_cached(ti_runtime: Runtime,
+                    filepath: str,
+                    preload: bool = False) -> 'AotModule':
+        """Load an AOT module through the process-wide module cache.
+
+        Repeated loads of unchanged module files on the same runtime share
+        one module. Call :meth:`release` instead of :meth:`destroy` when
+        done with it."""
+
+        from .module_cache import module_cache
+        return module_cache.acquire(ti_runtime, filepath, preload)
 
     @staticmethod
     def create(ti_runtime: Runtime,
-               data: c_void_p,
-               size: int) -> 'AotModule':
-        """Create an AOT module on the TiRuntime from data."""
+               data: Union[c_void_p, bytes, bytearray, memoryview, mmap.mmap, str, os.PathLike],
+               size: Optional[int] = None) -> 'AotModule':
+        """Create an AOT module on the TiRuntime from TCM data.
+
+        `data` is either a raw pointer with its `size`, any contiguous
+        buffer (`bytes`, `bytearray`, `memoryview`, `mmap.mmap`), whose
+        address is passed through without copying, or the path of a `.tcm`
+        file, which is memory-mapped rather than read."""
+
+        if isinstance(data, (str, os.PathLike)):
+            with open(data, 'rb') as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                aot_module = AotModule.create(ti_runtime, mapped)
+
+            kernel_names, graph_names = read_module_index(os.fspath(data))
+            aot_module._kernels.extend(kernel_names)
+            aot_module._compute_graphs.extend(graph_names)
+            return aot_module
+
+        buffer = None
+        if not isinstance(data, (c_void_p, int)):
+            buffer = np.frombuffer(data, dtype=np.uint8)
+            if size is None:
+                size = buffer.nbytes
+            elif size > buffer.nbytes:
+                raise ValueError(f"A size of {size} bytes exceeds the "
+                                 f"{buffer.nbytes}-byte TCM buffer.")
+
+            data = c_void_p(buffer.ctypes.data)
+
+        elif size is None:
+            raise ValueError("The size of TCM data passed by pointer is required.")
 
         aot_module_instance = ti_create_aot_module(ti_runtime.runtime_instance, data, size)
+        del buffer
 
-        get_last_error()
-        return AotModule(aot_module_instance)
+        get_last_error(ti_runtime=ti_runtime)
+        return AotModule(aot_module_instance, ti_runtime=ti_runtime)
 
     def destroy(self) -> None:
         """Destroy an AOT module on the TiRuntime."""
 
         ti_destroy_aot_module(self._aot_module)
+        self._kernels.clear()
+        self._compute_graphs.clear()
 
-    def get_kernel(self, kernel_name: str) -> Kernel:
-        """Get a kernel from an AOT module on the TiRuntime."""
+    def release(self) -> None:
+        """Release a cached AOT module, or destroy an uncached one."""
 
-        kernel_instance = ti_get_aot_module_kernel(self._aot_module, kernel_name)
+        if self._cache is not None:
+            self._cache.release(self)
+        else:
+            self.destroy()
 
-        get_last_error()
-        return Kernel(kernel_instance)
+    @property
+    def kernels(self) -> Mapping:
+        """Kernels of the module by name, with their handles fetched once
+        and memoized."""
 
-    def get_compute_graph(self, graph_name: str) -> ComputeGraph:
-        """Get a compute graph from an AOT module on the TiRuntime."""
+        return self._kernels
+
+    @property
+    def compute_graphs(self) -> Mapping:
+        """Compute graphs of the module by name, with their handles fetched
+        once and memoized."""
+
+        return self._compute_graphs
+
+    def preload(self) -> None:
+        """Fetch the handles of every indexed kernel and compute graph."""
+
+        self._kernels.preload()
+        self._compute_graphs.preload()
+
+    def _fetch_kernel(self, kernel_name: str) -> TiKernel:
+        kernel_instance = ti_get_aot_module_kernel(self._aot_module, kernel_name)
 
+        get_last_error(ti_runtime=self.runtime)
+        return kernel_instance
+
+    def _fetch_compute_graph(self, graph_name: str) -> TiComputeGraph:
         compute_graph_instance = ti_get_aot_module_compute_graph(self._aot_module, graph_name)
 
-        get_last_error()
-        return ComputeGraph(compute_graph_instance)
+        get_last_error(ti_runtime=self.runtime)
+        return compute_graph_instance
+
+    def get_kernel(self, kernel_name: str) -> Kernel:
+        """Get a kernel from an AOT module on the TiRuntime. The handle is
+        memoized by name, the returned kernel and its history are the
+        caller's own."""
+
+        return self._kernels.resolve(kernel_name)
+
+    def get_compute_graph(self, graph_name: str) -> ComputeGraph:
+        """Get a compute graph from an AOT module on the TiRuntime. The
+        handle is memoized by name, the returned graph and its bound
+        arguments are the caller's own."""
+
+        return self._compute_graphs.resolve(graph_name)
@@ -1,18 +1,118 @@
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
+from .kernel_argument import KernelArgument, rebind_arguments
 from .runtime import Runtime
 from taichiAOT._utils import *
+from taichiAOT._instrumentation import record_launch, start_timer
+
+# Encoded argument names, shared by all graphs and kept alive for the
+# `c_char_p` fields pointing at them.
+_encoded_names: Dict[str, bytes] = {}
+
+
+def _encode_name(name: str) -> bytes:
+    encoded = _encoded_names.get(name)
+    if encoded is None:
+        encoded = _encoded_names[name] = name.encode('utf-8')
+
+    return encoded
+
+
+class _NamedArgumentTable:
+    """The persistent `TiNamedArgument` array of a graph for one set of
+    argument names on one runtime."""
+
+    def __init__(self, ti_runtime: Runtime, kwargs: Dict[str, Any]):
+        self.runtime: Runtime = ti_runtime
+        self.names: Tuple[str, ...] = tuple(kwargs)
+        self.arguments: List[KernelArgument] = [KernelArgument(ti_runtime, arg)
+                                                for arg in kwargs.values()]
+        self.ti_named_arguments = (TiNamedArgument * len(self.arguments))(
+            *[TiNamedArgument(name=_encode_name(name), argument=argument.get_ti_argument)
+              for name, argument in zip(self.names, self.arguments)])
+
+    def bind(self, args) -> None:
+        for index in rebind_arguments(self.runtime, self.arguments, list(args)):
+            self.ti_named_arguments[index].argument = self.arguments[index].get_ti_argument
+
+    def argument_bytes(self) -> List[int]:
+        return [argument.og.nbytes
+                if argument.type == TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY else 0
+                for argument in self.arguments]
+
+    def release(self) -> None:
+        for argument in self.arguments:
+            argument.release()
 
 
 class ComputeGraph:
-    def __init__(self, compute_graph_instance: TiComputeGraph):
+    def __init__(self, compute_graph_instance: TiComputeGraph,
+                 name: Optional[str] = None):
         self._compute_graph: TiComputeGraph = compute_graph_instance
+        self.name: Optional[str] = name
+        self._table: Optional[_NamedArgumentTable] = None
 
     @staticmethod
     def from_aot_module(ti_aot_module, compute_graph_name: str):
         return ti_aot_module.get_compute_graph(compute_graph_name)
 
-    def launch(self, ti_runtime: Runtime, named_args: List[TiNamedArgument]) -> None:
-        """Description placeholder"""
+    def launch(self, ti_runtime: Runtime,
+               named_args: Optional[List[TiNamedArgument]] = None, **kwargs) -> None:
+        """Launches the compute graph with NumPy arrays, device arrays and
+        scalars passed by argument name.
+
+        The named argument table is built on the first launch and kept.
+        Later launches with the same names on the same runtime only patch
+        the scalars that changed and re-upload ndarrays into their already
+        bound memory. Prebuilt `TiNamedArgument` structures can still be
+        passed as `named_args` instead."""
+
+        start = start_timer()
+
+        if named_args is not None:
+            ti_launch_compute_graph(ti_runtime.runtime_instance, self._compute_graph,
+                                    len(named_args), named_args)
+        else:
+            table = self._table
+            if table is None or table.runtime is not ti_runtime \
+                    or table.names != tuple(kwargs):
+                if table is not None:
+                    table.runtime.defer_release(table)
+
+                table = self._table = _NamedArgumentTable(ti_runtime, kwargs)
+            else:
+                table.bind(kwargs.values())
+
+            ti_launch_compute_graph(ti_runtime.runtime_instance, self._compute_graph,
+                                    len(table.arguments), table.ti_named_arguments)
+
+        get_last_error(ti_runtime=ti_runtime)
+        ti_runtime.record_launch()
+
+        if start:
+            record_launch(self.name, start, argument_bytes=self._table.argument_bytes()
+                          if named_args is None else [])
+
+    def get_arguments(self) -> Dict[str, Any]:
+        """Reads back the ndarray arguments of the latest launch by name,
+        keeping their memory bound."""
+
+        if self._table is None:
+            return {}
+
+        self._table.runtime.synchronize_for_readback()
+
+        res_params = {}
+        for name, argument in zip(self._table.names, self._table.arguments):
+            if argument.type == TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY:
+                res_params[name] = argument.memory.read(argument.og.dtype, argument.og.shape)
+
+        get_last_error(ti_runtime=self._table.runtime)
+        return res_params
+
+    def release(self) -> None:
+        """Releases the memory bound to the ndarray arguments."""
 
-        ti_launch_compute_graph(ti_runtime, self._compute_graph, len(named_args), named_args)
+        if self._table is not None:
+            self._table.release()
+            self._table = None
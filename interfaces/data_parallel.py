@@ -0,0 +1,172 @@
+from collections import deque
+from time import perf_counter
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .aot_module import AotModule
+from .kernel import Kernel
+from .runtime import Runtime
+
+
+class DataParallel:
+    """Splits the launches of one kernel across several runtimes.
+
+    The ndarray arguments are sharded along `axis`, each shard is launched
+    on its own runtime concurrently, on the runtime executor thread, and
+    the read back ndarray arguments are concatenated along `axis` again.
+    Scalars are passed to every shard. This only suits kernels whose
+    elements are independent along the split axis.
+
+    Shard sizes follow the throughput measured on each runtime, so faster
+    devices get larger shards. The launch time of a shard is fitted as a
+    fixed overhead plus a cost per element over the latest `samples`
+    launches, and the throughput is a moving average of the inverse cost
+    with `smoothing` as the weight of the latest launch. The fixed
+    overhead thus does not make small shards look slow. Weights stay
+    within `max_imbalance` times the equal share.
+    """
+
+    def __init__(self, runtimes: Sequence[Runtime], kernels: Sequence[Kernel],
+                 axis: int = 0, smoothing: float = 0.5, samples: int = 16,
+                 max_imbalance: float = 4.0):
+        if len(runtimes) != len(kernels) or not runtimes:
+            raise ValueError("One kernel per runtime is required.")
+
+        self.runtimes: List[Runtime] = list(runtimes)
+        self.kernels: List[Kernel] = list(kernels)
+        self.axis: int = axis
+        self.smoothing: float = smoothing
+        self.max_imbalance: float = max_imbalance
+        self.throughput: List[Optional[float]] = [None] * len(self.runtimes)
+        self._samples: List[Deque[Tuple[int, float]]] = [deque(maxlen=samples)
+                                                         for _ in self.runtimes]
+        self._modules: List[AotModule] = []
+
+    @staticmethod
+    def load(runtimes: Sequence[Runtime], module_path: str, kernel_name: str,
+             axis: int = 0) -> 'DataParallel':
+        """Loads a module on every runtime through the module cache and
+        splits the launches of one of its kernels. The module references
+        are dropped by :meth:`release`."""
+
+        modules = [AotModule.load_cached(ti_runtime, module_path) for ti_runtime in runtimes]
+        try:
+            data_parallel = DataParallel(runtimes, [aot_module.get_kernel(kernel_name)
+                                                    for aot_module in modules], axis)
+        except BaseException:
+            for aot_module in modules:
+                aot_module.release()
+            raise
+
+        data_parallel._modules = modules
+        return data_parallel
+
+    def __enter__(self) -> 'DataParallel':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    def release(self) -> None:
+        """Releases the modules loaded by :meth:`load`."""
+
+        modules, self._modules = self._modules, []
+        for aot_module in modules:
+            aot_module.release()
+
+    def weights(self) -> List[float]:
+        """Gets the fraction of the elements each runtime gets, even until
+        its throughput is measured."""
+
+        measured = [throughput for throughput in self.throughput if throughput]
+        default = sum(measured) / len(measured) if measured else 1.0
+        throughput = [value or default for value in self.throughput]
+        weights = [value / sum(throughput) for value in throughput]
+
+        equal = 1.0 / len(weights)
+        weights = [min(max(weight, equal / self.max_imbalance), equal * self.max_imbalance)
+                   for weight in weights]
+        return [weight / sum(weights) for weight in weights]
+
+    def shard_sizes(self, length: int) -> List[int]:
+        """Splits `length` elements by the runtime weights, rounding by
+        largest remainder."""
+
+        quotas = [weight * length for weight in self.weights()]
+        sizes = [int(quota) for quota in quotas]
+        by_remainder = sorted(range(len(quotas)), key=lambda index: sizes[index] - quotas[index])
+        for index in by_remainder[:length - sum(sizes)]:
+            sizes[index] += 1
+
+        return sizes
+
+    @staticmethod
+    def _cost_per_element(samples: Sequence[Tuple[int, float]]) -> float:
+        mean_elements = sum(elements for elements, _ in samples) / len(samples)
+        mean_seconds = sum(seconds for _, seconds in samples) / len(samples)
+
+        # Shard sizes too close together leave the fit to timing noise.
+        spread = max(elements for elements, _ in samples) - min(elements for elements, _ in samples)
+        variance = sum((elements - mean_elements) ** 2 for elements, _ in samples)
+        if spread >= 0.2 * mean_elements:
+            slope = sum((elements - mean_elements) * (seconds - mean_seconds)
+                        for elements, seconds in samples) / variance
+            if slope > 0.0:
+                return slope
+
+        return mean_seconds / mean_elements
+
+    def _record(self, index: int, elements: int, seconds: float) -> None:
+        if seconds <= 0.0:
+            return
+
+        self._samples[index].append((elements, seconds))
+        throughput = 1.0 / self._cost_per_element(self._samples[index])
+        previous = self.throughput[index]
+        self.throughput[index] = throughput if previous is None \
+            else previous + self.smoothing * (throughput - previous)
+
+    @staticmethod
+    def _launch_shard(ti_runtime: Runtime, kernel: Kernel, *args) -> tuple:
+        start = perf_counter()
+        arena = kernel.launch_detached(ti_runtime, *args)
+
+        with arena:
+            outputs = arena.read_back()
+
+        return outputs, perf_counter() - start
+
+    def launch(self, *args) -> List[Any]:
+        """Launches the kernel on every runtime with its shard of `args`
+        and gathers the ndarray arguments read back from all shards."""
+
+        lengths = {arg.shape[self.axis] if -arg.ndim <= self.axis < arg.ndim else None
+                   for arg in args if isinstance(arg, np.ndarray)}
+        if len(lengths) != 1 or None in lengths:
+            raise ValueError(f"The ndarray arguments must have one common length "
+                             f"along axis {self.axis}, got {lengths}.")
+
+        length = lengths.pop()
+        futures, offset = [], 0
+        for index, size in enumerate(self.shard_sizes(length)):
+            if size == 0:
+                continue
+
+            shard = slice(offset, offset + size)
+            offset += size
+
+            shard_args = [arg[(slice(None),) * (self.axis % arg.ndim) + (shard,)]
+                          if isinstance(arg, np.ndarray) else arg
+                          for arg in args]
+            ti_runtime = self.runtimes[index]
+            futures.append((index, size, ti_runtime.executor.submit(
+                self._launch_shard, ti_runtime, self.kernels[index], *shard_args)))
+
+        shard_outputs = []
+        for index, size, future in futures:
+            outputs, seconds = future.result()
+            self._record(index, size, seconds)
+            shard_outputs.append(outputs)
+
+        return [np.concatenate(outputs, axis=self.axis) for outputs in zip(*shard_outputs)]
@@ -0,0 +1,159 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from taichiAOT.c_api import *
+from taichiAOT._instrumentation import record_transfer, start_timer
+from taichiAOT.metrics import DEVICE_TO_HOST, HOST_TO_DEVICE
+from .memory import Memory
+from .runtime import Runtime
+
+
+class DeviceNdArray:
+    """An ND-array resident in device memory.
+
+    A device array can be passed to :meth:`Kernel.launch` in place of a
+    NumPy array, in which case the kernel reads and writes its memory
+    directly, so chained kernels never bounce intermediates through the
+    host. The data is only downloaded by :meth:`to_numpy`.
+    """
+
+    def __init__(self, memory: Memory, shape: Tuple[int, ...], dtype):
+        self._memory: Optional[Memory] = memory
+        self.shape: Tuple[int, ...] = tuple(shape)
+        self.dtype: np.dtype = np.dtype(dtype)
+
+    def __del__(self):
+        memory, self._memory = getattr(self, '_memory', None), None
+        if memory is not None:
+            memory.runtime.release_from_finalizer(memory)
+
+    @staticmethod
+    def empty(ti_runtime: Runtime, shape: Tuple[int, ...], dtype) -> 'DeviceNdArray':
+        """Allocates an uninitialized device array on the runtime."""
+
+        dtype = np.dtype(dtype)
+        host_visible = TI_FALSE if ti_runtime.upload_mode == 'staged' else TI_TRUE
+        memory_allocate_info = TiMemoryAllocateInfo(
+            size=int(np.prod(shape, dtype=np.int64)) * dtype.itemsize,
+            host_write=host_visible,
+            host_read=host_visible,
+            export_sharing=TI_FALSE,
+            usage=TiMemoryUsageFlags.TI_MEMORY_USAGE_STORAGE_BIT)
+
+        return DeviceNdArray(ti_runtime.memory_pool.acquire(memory_allocate_info),
+                             shape, dtype)
+
+    @staticmethod
+    def from_numpy(ti_runtime: Runtime, array: np.ndarray) -> 'DeviceNdArray':
+        """Uploads a NumPy array into a new device array."""
+
+        device_array = DeviceNdArray.empty(ti_runtime, array.shape, array.dtype)
+        device_array.upload(array)
+        return device_array
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * self.dtype.itemsize
+
+    @property
+    def memory(self) -> Optional[Memory]:
+        """The device memory holding the array, None once released."""
+
+        return self._memory
+
+    @property
+    def runtime(self) -> Runtime:
+        return self._require_memory().runtime
+
+    def __len__(self) -> int:
+        if not self.shape:
+            raise TypeError("len() of unsized object")
+
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(shape={self.shape}, dtype={self.dtype})"
+
+    def _require_memory(self) -> Memory:
+        if self._memory is None:
+            raise RuntimeError("The device array has already been released.")
+
+        return self._memory
+
+    def _read(self, offset: int, shape: Tuple[int, ...]) -> np.ndarray:
+        memory = self._require_memory()
+        memory.runtime.synchronize_for_readback()
+        start = start_timer()
+
+        host_array = memory.read(self.dtype, shape, offset)
+
+        if start:
+            record_transfer(DEVICE_TO_HOST, host_array.nbytes, start)
+
+        return host_array
+
+    def to_numpy(self) -> np.ndarray:
+        """Downloads the array to a new host array."""
+
+        return self._read(0, self.shape)
+
+    def upload(self, array: np.ndarray) -> None:
+        """Overwrites the array with the contents of a host array."""
+
+        if array.shape != self.shape:
+            raise ValueError(f"Cannot upload an array of shape {array.shape} "
+                             f"into a device array of shape {self.shape}.")
+
+        memory = self._require_memory()
+        memory.runtime.synchronize_for_readback()
+        start = start_timer()
+
+        memory.write(np.asarray(array).astype(self.dtype, casting='same_kind', copy=False))
+
+        if start:
+            record_transfer(HOST_TO_DEVICE, self.nbytes, start)
+
+        self.invalidate()
+
+    def copy_to(self, other: 'DeviceNdArray') -> None:
+        """Copies the array into another device array of the same size on
+        the device."""
+
+        if other.nbytes != self.nbytes:
+            raise ValueError(f"Cannot copy {self.nbytes} bytes into a "
+                             f"{other.nbytes}-byte device array.")
+
+        memory = self._require_memory()
+        ti_copy_memory_device_to_device(memory.runtime.runtime_instance,
+                                        memory.slice(0, self.nbytes),
+                                        other._require_memory().slice(0, self.nbytes))
+        memory.runtime.record_launch()
+        other.invalidate()
+
+    def clone(self) -> 'DeviceNdArray':
+        """Copies the array into a new device array on the device."""
+
+        device_array = DeviceNdArray.empty(self.runtime, self.shape, self.dtype)
+        self.copy_to(device_array)
+        return device_array
+
+    def invalidate(self) -> None:
+        """Notifies the array that its device contents were changed."""
+
+        pass
+
+    def release(self) -> None:
+        """Returns the device memory once no pending launch can use it."""
+
+        if self._memory is not None:
+            memory, self._memory = self._memory, None
+            memory.runtime.release_when_idle(memory)
@@ -1,48 +1,139 @@
-from ctypes import POINTER, cast
-from typing import Any
+from collections import deque
+from threading import RLock
+from typing import Any, Deque, Optional
 
-import numpy as np
-
-from .kernel_argument import KernelArgument
+from .device_ndarray import DeviceNdArray
+from .launch_arena import LaunchArena
+from .prepared_launch import PreparedLaunch
 from .runtime import Runtime
 from taichiAOT.c_api import *
 from taichiAOT._utils import get_last_error
-from taichiAOT.interfaces._type_maps import get_ctypes_data_type
+from taichiAOT._instrumentation import record_launch, start_timer
 
 
 class Kernel:
-    def __init__(self, kernel_instance: TiKernel):
+    def __init__(self, kernel_instance: TiKernel, history_size: int = 4,
+                 name: Optional[str] = None):
+        if history_size < 1:
+            raise ValueError("The kernel history must keep at least the latest launch.")
+
         self._kernel: TiKernel = kernel_instance
-        self.arg_params = []
-        self.kernel_params = []
-
-    def set_arguments(self, ti_runtime: Runtime, *args):
-        for arg in args:
-            argument = KernelArgument(ti_runtime, arg)
-            self.arg_params.append(argument)
-            self.kernel_params.append(argument.get_ti_argument)
-
-        get_last_error()
-
-    def launch(self, ti_runtime: Runtime, *args):
-        if args is not None:
-            self.set_arguments(ti_runtime, *args)
-
-        get_last_error()
-        ti_launch_kernel(ti_runtime.runtime_instance, self._kernel,
-                         len(self.kernel_params), self.kernel_params)
-
-    def get_arguments(self) -> list[Any]:
-        res_params = []
-        for param in self.arg_params:
-            if param.type == TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY:
-                data_array = cast(param.allocated_memory.map(),
-                                  POINTER(get_ctypes_data_type(
-                                      param.og) * param.og.size)).contents
-
-                res_params.append(np.array(data_array).reshape(param.og.shape))
-                param.allocated_memory.unmap()
-                param.allocated_memory.free()
-
-        get_last_error()
+        self.name: Optional[str] = name
+        self.history: Deque[LaunchArena] = deque()
+        self.history_size: int = history_size
+        self._lock = RLock()
+
+    def set_arguments(self, ti_runtime: Runtime, *args) -> LaunchArena:
+        """Uploads the arguments of a launch into a new arena.
+
+        The arena is kept in a bounded history; the oldest one is retired
+        and released once the runtime is idle, see
+        :meth:`Runtime.defer_release`."""
+
+        with self._lock:
+            arena = self._push_arena(ti_runtime, *args)
+
+        get_last_error(ti_runtime=ti_runtime)
+        return arena
+
+    def _push_arena(self, ti_runtime: Runtime, *args) -> LaunchArena:
+        arena = LaunchArena(ti_runtime, *args)
+        self.history.append(arena)
+        while len(self.history) > self.history_size and self.history[0] is not arena:
+            self.history.popleft().retire()
+
+        return arena
+
+    def launch(self, ti_runtime: Runtime, *args) -> LaunchArena:
+        """Launches the kernel with `args`, or relaunches the latest
+        arguments if none are given."""
+
+        start = start_timer()
+
+        with self._lock:
+            if args or not self.history:
+                arena = self._push_arena(ti_runtime, *args)
+            else:
+                arena = self.history[-1]
+                if arena.released:
+                    raise RuntimeError("The latest launch has been read back, "
+                                       "pass its arguments again to relaunch it.")
+
+            ti_launch_kernel(ti_runtime.runtime_instance, self._kernel,
+                             len(arena), arena.ti_arguments)
+            get_last_error(ti_runtime=ti_runtime)
+            ti_runtime.record_launch()
+
+        if start:
+            record_launch(self.name, start, argument_bytes=arena.argument_bytes())
+
+        return arena
+
+    def prepare(self, ti_runtime: Runtime, *template_args) -> PreparedLaunch:
+        """Binds the kernel to a runtime and a persistent argument array
+        built from `template_args` for repeated launches."""
+
+        prepared_launch = PreparedLaunch(self._kernel, ti_runtime, *template_args)
+        prepared_launch.kernel_name = self.name
+        return prepared_launch
+
+    def launch_detached(self, ti_runtime: Runtime, *args) -> LaunchArena:
+        """Launches the kernel like :meth:`launch`, but keeps the arena out
+        of the history. The caller owns it and must release it."""
+
+        with self._lock:
+            arena = self.launch(ti_runtime, *args)
+            self.history.remove(arena)
+
+        return arena
+
+    async def launch_async(self, ti_runtime: Runtime, *args) -> list[Any]:
+        """Launches the kernel on the runtime executor thread, waits for it
+        there and resolves to the read back ndarray arguments.
+
+        The kernel history is locked, so launches from other threads may
+        interleave, but the runtime itself is not thread-safe: while the
+        launch is pending, use the runtime only through
+        :meth:`Runtime.run_async` or its executor."""
+
+        def launch_and_read_back() -> list[Any]:
+            arena = self.launch_detached(ti_runtime, *args)
+            ti_runtime.wait()
+
+            with arena:
+                return arena.read_back()
+
+        return await ti_runtime.run_async(launch_and_read_back)
+
+    def read_back(self, arena: LaunchArena) -> list[DeviceNdArray]:
+        """Returns the ndarray arguments of a launch as lazy arrays that
+        are only read back on access, and releases its arena. Device array
+        arguments are returned as they are."""
+
+        with self._lock:
+            if arena in self.history:
+                self.history.remove(arena)
+
+        res_params = arena.detach()
+
+        get_last_error(ti_runtime=arena.runtime)
+        return res_params
+
+    def get_arguments(self, launch: int = -1) -> list[DeviceNdArray]:
+        """Returns the ndarray arguments of a launch in the history, the
+        latest by default, as lazy arrays, or an empty list if nothing was
+        launched yet.
+
+        The arrays take over the memory of the arena, which stays in the
+        history until it is evicted, so reading the same launch again
+        returns the same arrays."""
+
+        with self._lock:
+            if not self.history:
+                return []
+
+            arena = self.history[launch]
+            res_params = arena.detach(keep=True)
+
+        get_last_error(ti_runtime=arena.runtime)
         return res_params
@@ -1,10 +1,12 @@
-from ctypes import sizeof, memmove, POINTER, cast
-from typing import Any
+from typing import Any, List, Sequence
 
 import numpy as np
 
 from taichiAOT.c_api import *
+from taichiAOT._instrumentation import record_transfer, start_timer
+from taichiAOT.metrics import HOST_TO_DEVICE
 from ._type_maps import *
+from .device_ndarray import DeviceNdArray
 from .memory import Memory
 from .runtime import Runtime
 
@@ -30,33 +32,131 @@ class KernelArgument:
 
         return type_value_map.get(self.type, lambda x: None)(arg)
 
-    def _to_ti_ndarray(self, array: np.ndarray, ti_runtime):
-        size = array.size
+    def _to_ti_ndarray(self, array, ti_runtime):
+        if isinstance(array, DeviceNdArray):
+            array.invalidate()
+            return self._ti_ndarray(array.memory, array)
+
+        host_visible = TI_FALSE if ti_runtime.upload_mode == 'staged' else TI_TRUE
         memory_allocate_info = TiMemoryAllocateInfo(
-            size=size * sizeof(get_ctypes_data_type(array)),
-            host_write=TI_TRUE,
-            host_read=TI_TRUE,
+            size=array.nbytes,
+            host_write=host_visible,
+            host_read=host_visible,
             export_sharing=TI_FALSE,
             usage=TiMemoryUsageFlags.TI_MEMORY_USAGE_STORAGE_BIT)
 
-        self.allocated_memory = Memory.allocate(ti_runtime, memory_allocate_info)
-        mapped_data = self.allocated_memory.map()
-        data_array = cast(mapped_data, POINTER(size * get_ctypes_data_type(array)))
+        self.allocated_memory = ti_runtime.memory_pool.acquire(memory_allocate_info)
+        self._upload(array)
 
-        memmove(data_array, array.ctypes.data, size * sizeof(get_ctypes_data_type(array)))
-        self.allocated_memory.unmap()
+        return self._ti_ndarray(self.allocated_memory, array)
 
+    @staticmethod
+    def _ti_ndarray(memory: Memory, array) -> TiNdArray:
         array_shape = TiNdShape(dim_count=len(array.shape), dims=(c_uint32 * 16)(*list(array.shape)))
         return TiNdArray(
-            memory=self.allocated_memory.memory_instance,
+            memory=memory.memory_instance,
             shape=array_shape,
             elem_shape=array_shape,
             elem_type=get_ndarray_ti_data_type(array)
         )
 
+    def _upload(self, array: np.ndarray) -> None:
+        """Copies a host array into the bound memory in one pass, see
+        :meth:`Memory.write`."""
+
+        start = start_timer()
+
+        self.allocated_memory.write(array)
+
+        if start:
+            record_transfer(HOST_TO_DEVICE, array.nbytes, start)
+
+    def update(self, arg: Any) -> bool:
+        """Rebinds the argument to a new value in place.
+
+        Scalars are patched and ndarrays of the same shape and dtype are
+        uploaded into the already bound memory. Returns False if the new
+        value needs a freshly built argument instead."""
+
+        if get_ti_argument_type(arg) != self.type:
+            return False
+
+        if self.type == TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY:
+            if isinstance(arg, DeviceNdArray) != isinstance(self.og, DeviceNdArray) \
+                    or arg.shape != self.og.shape or arg.dtype != self.og.dtype:
+                return False
+
+            if isinstance(arg, DeviceNdArray):
+                arg.invalidate()
+                self.value.ndarray.memory = arg.memory.memory_instance
+            else:
+                self._upload(arg)
+
+        elif self.type == TiArgumentType.TI_ARGUMENT_TYPE_I32:
+            self.value.i32 = arg
+
+        elif self.type == TiArgumentType.TI_ARGUMENT_TYPE_F32:
+            self.value.f32 = arg
+
+        else:
+            return False
+
+        self.og = arg
+        return True
+
+    @property
+    def memory(self) -> Memory:
+        """The memory bound to an ndarray argument."""
+
+        if isinstance(self.og, DeviceNdArray):
+            return self.og.memory
+
+        return self.allocated_memory
+
+    def release(self) -> None:
+        """Releases the memory the argument allocated itself. Device arrays
+        passed in stay owned by the caller."""
+
+        if self.allocated_memory is not None:
+            self.allocated_memory.release()
+            self.allocated_memory = None
+
     @property
     def get_ti_argument(self) -> TiArgument:
         return TiArgument(
             type=self.type,
             value=self.value
         )
+
+
+def rebind_arguments(ti_runtime: Runtime, arguments: List[KernelArgument],
+                     args: Sequence[Any]) -> List[int]:
+    """Rebinds the leading `arguments` to `args` in place. `None` keeps an
+    argument as is.
+
+    Scalars that changed are patched. NumPy arrays are re-uploaded into
+    their bound memory if the runtime is idle, and otherwise into a fresh
+    pooled block, since a pending launch may still read the old one, so
+    rebinding never waits. Arguments whose type or layout changed are
+    rebuilt as well, and replaced arguments are released once the runtime
+    is idle. Returns the indices of the arguments whose `TiArgument` has
+    to be refreshed."""
+
+    changed = []
+    for index, arg in enumerate(args):
+        if arg is None:
+            continue
+
+        argument = arguments[index]
+        if argument.type != TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY \
+                and type(arg) is type(argument.og) and arg == argument.og:
+            continue
+
+        in_flight = argument.allocated_memory is not None and not ti_runtime.idle
+        if in_flight or not argument.update(arg):
+            ti_runtime.release_when_idle(argument)
+            arguments[index] = KernelArgument(ti_runtime, arg)
+
+        changed.append(index)
+
+    return changed
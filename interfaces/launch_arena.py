@@ -0,0 +1,117 @@
+from typing import Any, List, Optional
+
+import numpy as np
+
+from .device_ndarray import DeviceNdArray
+from .kernel_argument import KernelArgument
+from .lazy_array import LazyArray
+from .runtime import Runtime
+from taichiAOT.c_api import *
+from taichiAOT._instrumentation import record_transfer, start_timer
+from taichiAOT.metrics import DEVICE_TO_HOST
+
+
+class LaunchArena:
+    """The arguments uploaded for a single kernel launch.
+
+    The arena owns the argument memory and the `TiArgument` array passed
+    to `ti_launch_kernel`. Its memory goes back to the runtime memory pool
+    when the arena is released, either explicitly, after reading it back,
+    or once the runtime is idle after it was retired.
+    """
+
+    def __init__(self, ti_runtime: Runtime, *args):
+        self._runtime: Runtime = ti_runtime
+        self.arguments: List[KernelArgument] = [KernelArgument(ti_runtime, arg)
+                                                for arg in args]
+        self.ti_arguments = (TiArgument * len(self.arguments))(
+            *[argument.get_ti_argument for argument in self.arguments])
+        self.released: bool = False
+        self._detached: Optional[List[DeviceNdArray]] = None
+
+    @property
+    def runtime(self) -> Runtime:
+        return self._runtime
+
+    def __len__(self) -> int:
+        return len(self.arguments)
+
+    def argument_bytes(self) -> List[int]:
+        """Gets the size of each argument, in bytes for ndarrays and 0 for
+        scalars."""
+
+        return [argument.og.nbytes
+                if argument.type == TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY else 0
+                for argument in self.arguments]
+
+    def __enter__(self) -> 'LaunchArena':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    def read_back(self, out: Optional[List[np.ndarray]] = None) -> List[Any]:
+        """Copies the ndarray arguments back to the host, into the `out`
+        arrays if given, one per ndarray argument."""
+
+        if self.released:
+            raise RuntimeError("The launch arena has already been released.")
+
+        self._runtime.synchronize_for_readback()
+        start = start_timer()
+
+        res_params = []
+        for argument in self.arguments:
+            if argument.type == TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY:
+                res_params.append(argument.memory.read(
+                    argument.og.dtype, argument.og.shape,
+                    out=out[len(res_params)] if out is not None else None))
+
+        if start:
+            record_transfer(DEVICE_TO_HOST, sum(array.nbytes for array in res_params), start)
+
+        return res_params
+
+    def detach(self, keep: bool = False) -> List[DeviceNdArray]:
+        """Hands the ndarray arguments over to lazy arrays, which then own
+        their memory, and releases the arena. Device arrays passed as
+        arguments are returned as they are. With `keep`, the arena holds
+        on to the arrays and detaching it again returns them."""
+
+        if self._detached is not None:
+            return self._detached
+
+        if self.released:
+            raise RuntimeError("The launch arena has already been released.")
+
+        lazy_arrays = []
+        for argument in self.arguments:
+            if isinstance(argument.og, DeviceNdArray):
+                lazy_arrays.append(argument.og)
+
+            elif argument.type == TiArgumentType.TI_ARGUMENT_TYPE_NDARRAY:
+                lazy_arrays.append(LazyArray(argument.allocated_memory,
+                                             argument.og.shape, argument.og.dtype))
+                argument.allocated_memory = None
+
+        self.release()
+        if keep:
+            self._detached = lazy_arrays
+
+        return lazy_arrays
+
+    def release(self) -> None:
+        """Returns the argument memory to the runtime memory pool."""
+
+        if self.released:
+            return
+
+        for argument in self.arguments:
+            argument.release()
+
+        self.released = True
+
+    def retire(self) -> None:
+        """Releases the arena once the device is done with it."""
+
+        self._runtime.release_when_idle(self)
@@ -0,0 +1,74 @@
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from .device_ndarray import DeviceNdArray
+from .memory import Memory
+
+
+class LazyArray(DeviceNdArray):
+    """A kernel ndarray argument left on the device until the host reads it.
+
+    Nothing is mapped or copied until the array is first accessed. Indexing
+    the leading axis with an integer or a unit-step slice reads back only
+    the byte range of the selected rows; any other access reads back and
+    caches the whole array. Releasing the array, or letting it be garbage
+    collected, returns its memory without touching the host.
+    """
+
+    def __init__(self, memory: Memory, shape: Tuple[int, ...], dtype):
+        super().__init__(memory, shape, dtype)
+        self._host: Optional[np.ndarray] = None
+
+    def __repr__(self) -> str:
+        state = 'host' if self._host is not None else 'device'
+        return f"LazyArray(shape={self.shape}, dtype={self.dtype}, {state})"
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        array = self.numpy()
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def numpy(self) -> np.ndarray:
+        """Reads back the whole array, caching the host copy."""
+
+        if self._host is None:
+            self._host = self._read(0, self.shape)
+
+        return self._host
+
+    def invalidate(self) -> None:
+        self._host = None
+
+    def _read_rows(self, start: int, stop: int) -> np.ndarray:
+        row_shape = self.shape[1:]
+        row_bytes = int(np.prod(row_shape, dtype=np.int64)) * self.dtype.itemsize
+        memory_slice = self._require_memory().slice(start * row_bytes,
+                                                    (stop - start) * row_bytes)
+
+        return self._read(memory_slice.offset, (stop - start,) + row_shape)
+
+    def __getitem__(self, key) -> Any:
+        if self._host is not None or not self.shape:
+            return self.numpy()[key]
+
+        rest = ()
+        if isinstance(key, tuple):
+            if not key:
+                return self.numpy()
+            key, rest = key[0], key[1:]
+
+        if isinstance(key, (int, np.integer)):
+            index = int(key) + self.shape[0] if key < 0 else int(key)
+            if not 0 <= index < self.shape[0]:
+                raise IndexError(f"index {key} is out of bounds for axis 0 "
+                                 f"with size {self.shape[0]}")
+
+            rows = self._read_rows(index, index + 1)[0]
+            return rows[rest] if rest else rows
+
+        if isinstance(key, slice) and key.step in (None, 1):
+            start, stop, _ = key.indices(self.shape[0])
+            rows = self._read_rows(start, max(start, stop))
+            return rows[(slice(None),) + rest] if rest else rows
+
+        return self.numpy()[(key,) + rest]
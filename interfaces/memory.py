@@ -1,28 +1,194 @@
-from ctypes import c_void_p
+from contextlib import contextmanager
+from ctypes import c_void_p, c_uint8, memmove
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
 
 from .runtime import Runtime
 from taichiAOT.c_api import *
+from taichiAOT.metrics import metrics
 
 
 class Memory:
-    def __init__(self, ti_runtime: Runtime, memory_instance: TiMemory) -> None:
+    def __init__(self, ti_runtime: Runtime, memory_instance: TiMemory,
+                 allocate_info: TiMemoryAllocateInfo = None) -> None:
         self._memory = memory_instance
         self._runtime = ti_runtime
+        self._mapped = None
+        self.allocate_info = allocate_info
+        self.persistent = False
+        self.pool = None
 
     @property
     def memory_instance(self) -> TiMemory:
         return self._memory
 
+    @property
+    def runtime(self) -> Runtime:
+        return self._runtime
+
+    @property
+    def size(self) -> int:
+        """Size of the allocation in bytes, if known."""
+
+        return self.allocate_info.size if self.allocate_info is not None else 0
+
+    @property
+    def host_visible(self) -> bool:
+        """Whether the memory can be mapped, as opposed to device-local
+        memory only reachable through device copies."""
+
+        info = self.allocate_info
+        return info is None or bool(info.host_read.value or info.host_write.value)
+
+    @property
+    def mapped(self) -> bool:
+        """Whether the memory is currently mapped to host-addressable space."""
+
+        return self._mapped is not None
+
     @staticmethod
     def allocate(ti_runtime: Runtime, allocate_info: TiMemoryAllocateInfo) -> 'Memory':
         memory_instance = ti_allocate_memory(ti_runtime.runtime_instance, allocate_info)
-        return Memory(ti_runtime, memory_instance)
+
+        if metrics.enabled:
+            metrics.record_allocation(allocate_info.size)
+
+        return Memory(ti_runtime, memory_instance, allocate_info)
 
     def free(self) -> None:
+        self.persistent = False
+        self.unmap()
         ti_free_memory(self._runtime.runtime_instance, self._memory)
 
+        if metrics.enabled:
+            metrics.record_free()
+
+    def release(self) -> None:
+        """Returns the memory to the pool it was acquired from, or frees it."""
+
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            self.free()
+
+    def slice(self, offset: int = 0, size: Optional[int] = None) -> TiMemorySlice:
+        """Describes the byte range `[offset, offset + size)` of the memory."""
+
+        if size is None:
+            size = self.size - offset
+
+        if self.allocate_info is not None and offset + size > self.size:
+            raise ValueError(f"A slice of {size} bytes at offset {offset} "
+                             f"exceeds the {self.size}-byte allocation.")
+
+        return TiMemorySlice(memory=self._memory, offset=offset, size=size)
+
     def map(self) -> c_void_p:
-        return ti_map_memory(self._runtime.runtime_instance, self._memory)
+        """Maps the memory to host-addressable space.
+
+        Mapping an already mapped memory returns the existing address."""
+
+        if self._mapped is None:
+            self._mapped = ti_map_memory(self._runtime.runtime_instance, self._memory)
+
+        return self._mapped
 
     def unmap(self) -> None:
+        """Unmaps the memory unless it is persistently mapped."""
+
+        if self._mapped is None or self.persistent:
+            return
+
         ti_unmap_memory(self._runtime.runtime_instance, self._memory)
+        self._mapped = None
+
+    def map_persistent(self) -> c_void_p:
+        """Maps a host-visible memory and keeps it mapped until
+        :meth:`unmap_persistent` or :meth:`free` is called."""
+
+        if not self.host_visible:
+            raise ValueError("Only host-visible memory can be persistently mapped.")
+
+        self.persistent = True
+        return self.map()
+
+    def unmap_persistent(self) -> None:
+        """Leaves the persistent-mapping mode and unmaps the memory."""
+
+        self.persistent = False
+        self.unmap()
+
+    def numpy_view(self, dtype, shape: Optional[Tuple[int, ...]] = None,
+                   offset: int = 0) -> np.ndarray:
+        """Maps the memory and returns a NumPy array aliasing it.
+
+        The view is only valid while the memory stays mapped."""
+
+        dtype = np.dtype(dtype)
+        if shape is None:
+            shape = ((self.size - offset) // dtype.itemsize,)
+
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        if self.allocate_info is not None and offset + nbytes > self.size:
+            raise ValueError(f"A view of {nbytes} bytes at offset {offset} "
+                             f"exceeds the {self.size}-byte allocation.")
+
+        if nbytes == 0:
+            return np.empty(shape, dtype=dtype)
+
+        buffer = (c_uint8 * nbytes).from_address(self.map() + offset)
+        return np.frombuffer(buffer, dtype=dtype).reshape(shape)
+
+    @contextmanager
+    def as_numpy(self, dtype, shape: Optional[Tuple[int, ...]] = None,
+                 offset: int = 0) -> Iterator[np.ndarray]:
+        """Context-managed NumPy view over the mapped memory.
+
+        Writes to the view land directly in the memory. The memory is
+        unmapped on exit unless it is persistently mapped, after which
+        the view must not be accessed."""
+
+        try:
+            yield self.numpy_view(dtype, shape, offset)
+        finally:
+            self.unmap()
+
+    def write(self, array: np.ndarray, offset: int = 0) -> None:
+        """Copies a host array into the memory at byte `offset`.
+
+        Host-visible memory is mapped and C-contiguous arrays are copied
+        with a single `memmove`, other layouts are gathered straight into
+        a C-ordered view. Device-local memory is written through the
+        runtime staging ring."""
+
+        if not self.host_visible:
+            self._runtime.staging_ring.upload(self, array, offset)
+        elif array.flags.c_contiguous:
+            if offset + array.nbytes > self.size > 0:
+                raise ValueError(f"A write of {array.nbytes} bytes at offset {offset} "
+                                 f"exceeds the {self.size}-byte allocation.")
+
+            memmove(self.map() + offset, array.ctypes.data, array.nbytes)
+            self.unmap()
+        else:
+            with self.as_numpy(array.dtype, array.shape, offset) as data_array:
+                np.copyto(data_array, array)
+
+    def read(self, dtype, shape: Tuple[int, ...], offset: int = 0,
+             out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Copies `shape` elements of `dtype` at byte `offset` back to the
+        host, into `out` if given.
+
+        Device-local memory is read through the runtime staging ring, which
+        waits for the runtime."""
+
+        if not self.host_visible:
+            return self._runtime.staging_ring.download(self, dtype, shape, offset, out)
+
+        with self.as_numpy(dtype, shape, offset) as data_array:
+            if out is None:
+                return data_array.copy()
+
+            np.copyto(out, data_array)
+            return out
@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, List, Tuple
+
+from taichiAOT.c_api import *
+from .memory import Memory
+
+
+def power_of_two_size_class(size: int, min_size: int = 256) -> int:
+    """Rounds an allocation size up to the next power of two."""
+
+    size = max(size, min_size)
+    return 1 << (size - 1).bit_length()
+
+
+class MemoryPool:
+    """Recycles device memory allocations of a single runtime.
+
+    Requested sizes are rounded up to a size class, and released blocks are
+    kept idle until a request of the same class and memory flags can reuse
+    them. Idle blocks are evicted least-recently-released first once their
+    total size exceeds `max_idle_bytes`.
+    """
+
+    def __init__(self, ti_runtime,
+                 max_idle_bytes: int = 256 * 1024 * 1024,
+                 size_class: Callable[[int], int] = power_of_two_size_class):
+        self._runtime = ti_runtime
+        self._size_class = size_class
+        self._lock = Lock()
+
+        self._free_lists: Dict[Tuple, List[Memory]] = {}
+        self._idle: 'OrderedDict[int, Tuple[Tuple, Memory]]' = OrderedDict()
+
+        self.max_idle_bytes: int = max_idle_bytes
+        self.idle_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    @staticmethod
+    def _key(allocate_info: TiMemoryAllocateInfo) -> Tuple:
+        return (allocate_info.size,
+                allocate_info.host_write.value,
+                allocate_info.host_read.value,
+                allocate_info.export_sharing.value,
+                allocate_info.usage)
+
+    def acquire(self, allocate_info: TiMemoryAllocateInfo) -> Memory:
+        """Returns an idle block fitting `allocate_info`, allocating a new
+        one on a miss."""
+
+        pooled_info = TiMemoryAllocateInfo(
+            size=self._size_class(allocate_info.size),
+            host_write=allocate_info.host_write,
+            host_read=allocate_info.host_read,
+            export_sharing=allocate_info.export_sharing,
+            usage=allocate_info.usage)
+        key = self._key(pooled_info)
+
+        with self._lock:
+            free_list = self._free_lists.get(key)
+            if free_list:
+                memory = free_list.pop()
+                del self._idle[id(memory)]
+                self.idle_bytes -= memory.size
+                self.hits += 1
+                return memory
+
+            self.misses += 1
+
+        memory = Memory.allocate(self._runtime, pooled_info)
+        memory.pool = self
+        return memory
+
+    def release(self, memory: Memory) -> None:
+        """Returns a block to the pool, evicting old idle blocks if the
+        idle byte budget is exceeded."""
+
+        key = self._key(memory.allocate_info)
+
+        with self._lock:
+            self._free_lists.setdefault(key, []).append(memory)
+            self._idle[id(memory)] = (key, memory)
+            self.idle_bytes += memory.size
+
+            evicted = self._evict(self.max_idle_bytes)
+
+        for block in evicted:
+            block.free()
+
+    def _evict(self, max_idle_bytes: int) -> List[Memory]:
+        evicted = []
+        while self._idle and self.idle_bytes > max_idle_bytes:
+            _, (key, memory) = self._idle.popitem(last=False)
+            self._free_lists[key].remove(memory)
+            self.idle_bytes -= memory.size
+            self.evictions += 1
+            evicted.append(memory)
+
+        return evicted
+
+    def trim(self, max_idle_bytes: int = 0) -> None:
+        """Frees idle blocks until at most `max_idle_bytes` remain idle."""
+
+        with self._lock:
+            evicted = self._evict(max_idle_bytes)
+
+        for block in evicted:
+            block.free()
+
+    def clear(self) -> None:
+        """Frees every idle block."""
+
+        self.trim(0)
+
+    def stats(self) -> dict:
+        """Gets the pool counters."""
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'idle_blocks': len(self._idle),
+            'idle_bytes': self.idle_bytes,
+        }
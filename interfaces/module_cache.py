@@ -0,0 +1,166 @@
+import hashlib
+import os
+from threading import Event, Lock
+from typing import Dict, Optional, Tuple
+
+from taichiAOT.c_api import *
+from .aot_module import AotModule
+from .runtime import Runtime
+
+
+def _files(path: str):
+    if os.path.isdir(path):
+        for directory, _, file_names in sorted(os.walk(path)):
+            for file_name in sorted(file_names):
+                yield os.path.join(directory, file_name)
+    else:
+        yield path
+
+
+def _stamp(path: str, by_content: bool):
+    try:
+        return _read_stamp(path, by_content)
+    except OSError as error:
+        error_code = TiError.TI_ERROR_CORRUPTED_DATA
+        raise RuntimeError(f"Cannot read the AOT module at {path}: {error.strerror}. "
+                           f"{TiError.get_error_details(error_code)}\n"
+                           f"TiError code: {error_code}.") from error
+
+
+def _read_stamp(path: str, by_content: bool):
+    if by_content:
+        digest = hashlib.sha256()
+        for file_path in _files(path):
+            digest.update(os.path.relpath(file_path, path).encode('utf-8'))
+            with open(file_path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1 << 20), b''):
+                    digest.update(chunk)
+
+        return digest.hexdigest()
+
+    stats = [os.stat(file_path) for file_path in _files(path)]
+    return (max((stat.st_mtime_ns for stat in stats), default=0),
+            sum(stat.st_size for stat in stats))
+
+
+class _CacheEntry:
+    def __init__(self, aot_module: AotModule):
+        self.aot_module: AotModule = aot_module
+        self.references: int = 0
+        self.stale: bool = False
+
+
+class ModuleCache:
+    """Process-wide cache of loaded AOT modules.
+
+    Modules are keyed by runtime, resolved path and a stamp of the module
+    files, either their latest mtime and total size or, with
+    `by_content`, a SHA-256 of their contents. Acquiring a cached module
+    only bumps its reference count. Modules stay loaded while idle until
+    their files change or the cache is invalidated. Modules are loaded
+    outside of the cache lock, so only concurrent acquires of the same
+    module wait for each other.
+    """
+
+    def __init__(self, by_content: bool = False):
+        self.by_content: bool = by_content
+        self._lock = Lock()
+        self._entries: Dict[Tuple, _CacheEntry] = {}
+        self._keys: Dict[int, Tuple] = {}
+        self._loading: Dict[Tuple, Event] = {}
+
+    def acquire(self, ti_runtime: Runtime, filepath: str,
+                preload: bool = False) -> AotModule:
+        """Gets the module at `filepath` on `ti_runtime`, loading it only if
+        it is not cached or its files changed."""
+
+        path = os.path.realpath(filepath)
+        key = (ti_runtime, path, _stamp(path, self.by_content))
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.references += 1
+                    return entry.aot_module
+
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = Event()
+                    break
+
+            loading.wait()
+
+        try:
+            aot_module = AotModule.load(ti_runtime, path, preload)
+        except BaseException:
+            with self._lock:
+                del self._loading[key]
+            loading.set()
+            raise
+
+        with self._lock:
+            self._invalidate(lambda other: other[:2] == key[:2])
+
+            entry = _CacheEntry(aot_module)
+            entry.aot_module._cache = self
+            entry.references = 1
+            self._entries[key] = entry
+            self._keys[id(entry.aot_module)] = key
+            del self._loading[key]
+
+        loading.set()
+        return aot_module
+
+    def release(self, aot_module: AotModule) -> None:
+        """Drops a reference to a module, destroying it if it was
+        invalidated and nothing else uses it."""
+
+        with self._lock:
+            key = self._keys.get(id(aot_module))
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+
+            entry.references = max(entry.references - 1, 0)
+            if entry.stale and entry.references == 0:
+                self._drop(key)
+
+    def invalidate(self, filepath: Optional[str] = None,
+                   ti_runtime: Optional[Runtime] = None,
+                   force: bool = False) -> None:
+        """Evicts the modules matching `filepath` and `ti_runtime`, all of
+        them by default. Modules still in use are destroyed on their last
+        release, or right away with `force`."""
+
+        path = os.path.realpath(filepath) if filepath is not None else None
+
+        with self._lock:
+            self._invalidate(lambda key: (path is None or key[1] == path)
+                             and (ti_runtime is None or key[0] is ti_runtime),
+                             force)
+
+    def _invalidate(self, predicate, force: bool = False) -> None:
+        for key in [key for key in self._entries if predicate(key)]:
+            entry = self._entries[key]
+            entry.stale = True
+            if force or entry.references == 0:
+                self._drop(key)
+
+    def _drop(self, key: Tuple) -> None:
+        entry = self._entries.pop(key)
+        del self._keys[id(entry.aot_module)]
+        entry.aot_module._cache = None
+        entry.aot_module.destroy()
+
+    def stats(self) -> dict:
+        """Gets the number of cached modules and outstanding references."""
+
+        with self._lock:
+            return {
+                'modules': len(self._entries),
+                'references': sum(entry.references for entry in self._entries.values()),
+            }
+
+
+module_cache = ModuleCache()
@@ -0,0 +1,71 @@
+from typing import Any, List, Optional
+
+from .kernel_argument import KernelArgument, rebind_arguments
+from .launch_arena import LaunchArena
+from .runtime import Runtime
+from taichiAOT.c_api import *
+from taichiAOT._utils import get_last_error
+from taichiAOT._instrumentation import record_launch, start_timer
+
+
+class PreparedLaunch:
+    """A kernel launch bound to a runtime with a persistent argument array.
+
+    The `TiArgument` array is built once from the template arguments.
+    Later launches only patch the scalars that changed, re-upload ndarrays
+    into their already bound memory and rebuild arguments whose type or
+    layout changed.
+    """
+
+    def __init__(self, kernel_instance: TiKernel, ti_runtime: Runtime, *template_args):
+        self._kernel: TiKernel = kernel_instance
+        self._runtime: Runtime = ti_runtime
+        self._arena: LaunchArena = LaunchArena(ti_runtime, *template_args)
+        self.kernel_name: Optional[str] = None
+
+        get_last_error(ti_runtime=ti_runtime)
+
+    @property
+    def arguments(self) -> List[KernelArgument]:
+        return self._arena.arguments
+
+    def bind(self, *args) -> None:
+        """Rebinds the leading arguments. `None` keeps an argument as is."""
+
+        if len(args) > len(self.arguments):
+            raise ValueError(f"Expected at most {len(self.arguments)} "
+                             f"arguments, got {len(args)}.")
+
+        for index in rebind_arguments(self._runtime, self.arguments, args):
+            self._arena.ti_arguments[index] = self.arguments[index].get_ti_argument
+
+    def launch(self, *args) -> None:
+        """Rebinds the given arguments and launches the kernel."""
+
+        start = start_timer()
+
+        if args:
+            self.bind(*args)
+
+        ti_launch_kernel(self._runtime.runtime_instance, self._kernel,
+                         len(self._arena), self._arena.ti_arguments)
+        get_last_error(ti_runtime=self._runtime)
+        self._runtime.record_launch()
+
+        if start:
+            record_launch(self.kernel_name, start, argument_bytes=self._arena.argument_bytes())
+
+    __call__ = launch
+
+    def get_arguments(self) -> List[Any]:
+        """Reads back the ndarray arguments, keeping their memory bound."""
+
+        res_params = self._arena.read_back()
+
+        get_last_error(ti_runtime=self._runtime)
+        return res_params
+
+    def release(self) -> None:
+        """Releases the memory bound to the ndarray arguments."""
+
+        self._arena.release()
@@ -1,4 +1,13 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Iterator, Optional
+
 from taichiAOT._utils import *
+from .submission_policy import SubmissionPolicy
 
 
 class Runtime:
@@ -7,6 +16,22 @@ class Runtime:
         self._runtime: TiRuntime = ti_create_runtime(arch, device)
         self.arch: TiArch = arch
         self.device: int = device
+        self._memory_pool = None
+        self._staging_ring = None
+        self._pending_releases = []
+        self._pending_releases_lock = Lock()
+        self._finalized = deque()
+        self._executor = None
+        self._cache = None
+
+        self.error_check_mode: Optional[str] = None
+        self.upload_mode = 'direct'
+        self.submission_policy: SubmissionPolicy = SubmissionPolicy()
+        self._batch_depth = 0
+        self._pending_launches = 0
+        self._unsynchronized = False
+        self._last_flush = perf_counter()
+        self.wait_epoch: int = 0
 
     @property
     def runtime_instance(self) -> TiRuntime:
@@ -15,6 +40,164 @@ class Runtime:
 
         return self._runtime
 
+    @property
+    def memory_pool(self) -> 'MemoryPool':
+        """The pool recycling device memory allocated on this runtime."""
+
+        if self._memory_pool is None:
+            from .memory_pool import MemoryPool
+            self._memory_pool = MemoryPool(self)
+
+        return self._memory_pool
+
+    @memory_pool.setter
+    def memory_pool(self, memory_pool: 'MemoryPool') -> None:
+        if self._memory_pool is not None:
+            self._memory_pool.clear()
+
+        self._memory_pool = memory_pool
+
+    @property
+    def upload_mode(self) -> str:
+        """How ndarray arguments and device arrays are allocated and
+        uploaded: 'direct' maps host-visible memory, 'staged' keeps them in
+        device-local memory copied through the :attr:`staging_ring`."""
+
+        return self._upload_mode
+
+    @upload_mode.setter
+    def upload_mode(self, upload_mode: str) -> None:
+        if upload_mode not in ('direct', 'staged'):
+            raise ValueError(f"Unknown upload mode '{upload_mode}', "
+                             f"expected 'direct' or 'staged'.")
+
+        self._upload_mode = upload_mode
+
+    @property
+    def staging_ring(self) -> 'StagingRing':
+        """The host-visible staging buffers for device-local memory."""
+
+        if self._staging_ring is None:
+            from .staging_ring import StagingRing
+            self._staging_ring = StagingRing(self)
+
+        return self._staging_ring
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The dedicated thread running blocking calls for the
+        asynchronous methods of this runtime."""
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f'taichi-runtime-{self.device}')
+
+        return self._executor
+
+    def run_async(self, func: Callable, *args) -> asyncio.Future:
+        """Runs `func(*args)` on the runtime executor thread and returns
+        a future of the running event loop resolving to its result.
+
+        Calls submitted this way are serialized, so the runtime should not
+        be used from other threads while they are pending."""
+
+        return asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def wait_async(self) -> None:
+        """Waits for all previously invoked device commands without
+        blocking the event loop."""
+
+        await self.run_async(self.wait)
+
+    @property
+    def idle(self) -> bool:
+        """Whether no device command was recorded since the last
+        :meth:`wait`."""
+
+        return not self._unsynchronized
+
+    def defer_release(self, resource) -> None:
+        """Releases `resource` after the next :meth:`wait`, once no device
+        command can still be using it.
+
+        The C API has no fences to tell earlier, so the runtime waits
+        once `submission_policy.max_pending_releases` are pending."""
+
+        with self._pending_releases_lock:
+            self._pending_releases.append(resource)
+            pending = len(self._pending_releases)
+
+        max_pending_releases = self.submission_policy.max_pending_releases
+        if max_pending_releases and pending >= max_pending_releases:
+            self.wait()
+
+    def release_when_idle(self, resource) -> None:
+        """Releases `resource` now if no launch is pending, otherwise
+        after the next :meth:`wait`."""
+
+        if self.idle:
+            resource.release()
+        else:
+            self.defer_release(resource)
+
+    def release_from_finalizer(self, resource) -> None:
+        """Queues `resource` to be released on the next :meth:`wait`.
+
+        Unlike :meth:`release_when_idle`, this neither calls the C API nor
+        waits nor takes a lock, so it is safe from a garbage collector
+        finalizer running on any thread."""
+
+        self._finalized.append(resource)
+
+    def _collect_finalized(self) -> None:
+        while True:
+            try:
+                resource = self._finalized.popleft()
+            except IndexError:
+                return
+
+            with self._pending_releases_lock:
+                self._pending_releases.append(resource)
+
+    def _release_pending(self) -> None:
+        self._collect_finalized()
+        with self._pending_releases_lock:
+            pending, self._pending_releases = self._pending_releases, []
+
+        for resource in pending:
+            resource.release()
+
+    def record_launch(self) -> None:
+        """Records a launch or another device command and flushes if the
+        submission policy asks for it outside of a :meth:`batch` scope."""
+
+        self._pending_launches += 1
+        self._unsynchronized = True
+
+        if self._batch_depth == 0 and self.submission_policy.should_flush(
+                self._pending_launches, (perf_counter() - self._last_flush) * 1000.0):
+            self.flush()
+
+    @contextmanager
+    def batch(self) -> Iterator['Runtime']:
+        """Groups the launches made inside the scope into one submission,
+        flushed when the outermost scope exits."""
+
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_launches:
+                self.flush()
+
+    def synchronize_for_readback(self) -> None:
+        """Waits for pending launches before the host reads device memory,
+        if the submission policy asks for it."""
+
+        if self._unsynchronized and self.submission_policy.wait_on_readback:
+            self.wait()
+
     @staticmethod
     def create(arch: TiArch = TiArch.TI_ARCH_VULKAN,
                device: int = 0) -> 'Runtime':
@@ -30,8 +213,59 @@ class Runtime:
 
         return Runtime(arch, device)
 
+    @staticmethod
+    def acquire(arch: TiArch = TiArch.TI_ARCH_VULKAN,
+                device: int = 0) -> 'Runtime':
+        """Gets a shared Taichi Runtime from the process-wide runtime cache.
+
+            Repeated acquires of the same arch and device share one
+            runtime, which stays warm for a while after its last
+            :meth:`release`, along with its memory pool and cached modules.
+
+            Args:
+                arch: specified TiArch.
+                device: the index of device to create Taichi Runtime on.
+
+            Returns:
+                The :class:`runtime` instance.
+            """
+
+        from .runtime_cache import runtime_cache
+        return runtime_cache.acquire(arch, device)
+
+    def release(self) -> None:
+        """Releases a cached Taichi Runtime, or destroys an uncached one."""
+
+        if self._cache is not None:
+            self._cache.release(self)
+        else:
+            self.destroy()
+
     def destroy(self) -> None:
-        """Destroys a Taichi Runtime."""
+        """Destroys a Taichi Runtime, waiting for pending device commands
+        first."""
+
+        if not self.idle:
+            self.wait()
+
+        if self._cache is not None:
+            self._cache.forget(self)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if self._staging_ring is not None:
+            self._staging_ring.release()
+            self._staging_ring = None
+
+        self._release_pending()
+        if self._memory_pool is not None:
+            self._memory_pool.clear()
+            self._memory_pool = None
+
+        from .module_cache import module_cache
+        module_cache.invalidate(ti_runtime=self, force=True)
 
         ti_destroy_runtime(self._runtime)
         self.arch = None
@@ -42,6 +276,10 @@ class Runtime:
         device for execution."""
 
         ti_flush(self._runtime)
+        check_deferred_errors(self)
+        self._collect_finalized()
+        self._pending_launches = 0
+        self._last_flush = perf_counter()
 
     def wait(self) -> None:
         """Waits until all previously invoked device commands are executed.
@@ -49,3 +287,9 @@ class Runtime:
          Any invoked command that has not been submitted is submitted first."""
 
         ti_wait(self._runtime)
+        check_deferred_errors(self)
+        self._pending_launches = 0
+        self._unsynchronized = False
+        self._last_flush = perf_counter()
+        self.wait_epoch += 1
+        self._release_pending()
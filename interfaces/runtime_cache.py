@@ -0,0 +1,141 @@
+import atexit
+from threading import Lock, Timer
+from time import monotonic
+from typing import Dict, Optional, Tuple
+
+from taichiAOT.c_api import *
+from .runtime import Runtime
+
+
+class _CacheEntry:
+    def __init__(self, runtime: Runtime):
+        self.runtime: Runtime = runtime
+        self.references: int = 0
+        self.idle_since: Optional[float] = None
+
+
+class RuntimeCache:
+    """Process-wide cache of shared runtimes keyed by arch and device.
+
+    Acquiring a cached runtime only bumps its reference count, so jobs
+    skip the runtime startup. A runtime released by all its users is kept
+    warm for `ttl` seconds, together with its memory pool and the modules
+    cached on it, before it is destroyed. Runtimes leave the cache under
+    its lock before they are destroyed, so an acquire never gets one that
+    is being torn down. Users sharing a runtime must still not use it from
+    several threads at once.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl: float = ttl
+        self._lock = Lock()
+        self._entries: Dict[Tuple[int, int], _CacheEntry] = {}
+        self._timer: Optional[Timer] = None
+
+    def acquire(self, arch: TiArch = TiArch.TI_ARCH_VULKAN, device: int = 0) -> Runtime:
+        """Gets the runtime on `device`, creating it if it is not cached."""
+
+        key = (int(arch), device)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _CacheEntry(Runtime(arch, device))
+                entry.runtime._cache = self
+                self._entries[key] = entry
+
+            entry.references += 1
+            entry.idle_since = None
+            return entry.runtime
+
+    def release(self, runtime: Runtime) -> None:
+        """Drops a reference to a runtime. Once unused, it is kept warm for
+        `ttl` seconds, or destroyed right away without a `ttl`."""
+
+        with self._lock:
+            entry = self._find(runtime)
+            if entry is None or entry.references == 0:
+                return
+
+            entry.references -= 1
+            if entry.references > 0:
+                return
+
+            if self.ttl > 0:
+                entry.idle_since = monotonic()
+                self._schedule()
+                return
+
+            # Removed under the lock, so no acquire can get it any more.
+            del self._entries[(int(runtime.arch), runtime.device)]
+            runtime._cache = None
+
+        runtime.destroy()
+
+    def _find(self, runtime: Runtime) -> Optional[_CacheEntry]:
+        entry = self._entries.get((int(runtime.arch), runtime.device)) \
+            if runtime.arch is not None else None
+        return entry if entry is not None and entry.runtime is runtime else None
+
+    def _schedule(self, delay: Optional[float] = None) -> None:
+        if self._timer is None and self.ttl > 0:
+            self._timer = Timer(self.ttl if delay is None else delay, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _expire(self) -> None:
+        with self._lock:
+            self._timer = None
+
+        self.evict()
+
+        with self._lock:
+            idle_since = [entry.idle_since for entry in self._entries.values()
+                          if entry.idle_since is not None]
+            if idle_since:
+                self._schedule(max(min(idle_since) + self.ttl - monotonic(), 0.0))
+
+    def evict(self, max_idle: Optional[float] = None) -> None:
+        """Destroys the runtimes idle for at least `max_idle` seconds, `ttl`
+        by default."""
+
+        max_idle = self.ttl if max_idle is None else max_idle
+        now = monotonic()
+
+        with self._lock:
+            expired = [key for key, entry in self._entries.items()
+                       if entry.idle_since is not None and now - entry.idle_since >= max_idle]
+            runtimes = [self._entries.pop(key).runtime for key in expired]
+
+        for runtime in runtimes:
+            runtime._cache = None
+            runtime.destroy()
+
+    def forget(self, runtime: Runtime) -> None:
+        """Removes a runtime from the cache without destroying it."""
+
+        with self._lock:
+            entry = self._find(runtime)
+            if entry is not None:
+                del self._entries[(int(runtime.arch), runtime.device)]
+                runtime._cache = None
+
+    def clear(self) -> None:
+        """Destroys every idle runtime right away."""
+
+        self.evict(max_idle=0.0)
+
+    def stats(self) -> dict:
+        """Gets the number of cached and idle runtimes and outstanding
+        references."""
+
+        with self._lock:
+            return {
+                'runtimes': len(self._entries),
+                'idle': sum(entry.references == 0 for entry in self._entries.values()),
+                'references': sum(entry.references for entry in self._entries.values()),
+            }
+
+
+runtime_cache = RuntimeCache()
+atexit.register(runtime_cache.clear)
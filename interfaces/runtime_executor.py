@@ -0,0 +1,191 @@
+import queue
+from concurrent.futures import Future
+from threading import Lock, Thread
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+from taichiAOT.c_api import *
+from .aot_module import AotModule
+from .device_ndarray import DeviceNdArray
+from .kernel import Kernel
+from .runtime import Runtime
+
+
+class RuntimeExecutor:
+    """A runtime owned by one dedicated thread and used through a queue.
+
+    A Taichi runtime must not be used from several threads at once. The
+    executor creates its runtime on its own thread and runs the jobs
+    submitted from any thread there, one at a time, returning
+    `concurrent.futures.Future` objects. Jobs queued while the thread is
+    busy are run as one batch, whose launches are flushed once when the
+    batch ends.
+
+    Modules, kernels and device arrays obtained through the executor
+    belong to its runtime and may only be used by later jobs; release
+    device arrays with :meth:`release` rather than dropping them on
+    another thread.
+    """
+
+    def __init__(self, arch: TiArch = TiArch.TI_ARCH_VULKAN, device: int = 0,
+                 max_batch: int = 64):
+        self.arch: TiArch = arch
+        self.device: int = device
+        self.max_batch: int = max_batch
+
+        self._runtime: Optional[Runtime] = None
+        self._queue = queue.SimpleQueue()
+        self._lock = Lock()
+        self._shutdown = False
+
+        started = Future()
+        self._thread = Thread(target=self._run, args=(started,), daemon=True,
+                              name=f'taichi-runtime-owner-{device}')
+        self._thread.start()
+        started.result()
+
+    def __enter__(self) -> 'RuntimeExecutor':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
+
+    @property
+    def runtime(self) -> Runtime:
+        """The owned runtime, only to be used from inside jobs."""
+
+        return self._runtime
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Runs `func(runtime, *args, **kwargs)` on the owner thread."""
+
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit jobs after the executor was shut down.")
+
+            self._queue.put((future, func, args, kwargs))
+
+        return future
+
+    def load_module(self, filepath: str) -> Future:
+        """Loads an AOT module with all its kernel and compute graph
+        handles fetched up front."""
+
+        return self.submit(AotModule.load, filepath, True)
+
+    def launch(self, kernel: Kernel, *args) -> Future:
+        """Launches a kernel of a module loaded through the executor. The
+        future resolves to None once the launch is submitted."""
+
+        return self.submit(self._launch, kernel, *args)
+
+    def launch_and_read_back(self, kernel: Kernel, *args) -> Future:
+        """Launches a kernel and resolves to its ndarray arguments read
+        back as host arrays."""
+
+        return self.submit(self._launch_and_read_back, kernel, *args)
+
+    def upload(self, array: np.ndarray) -> Future:
+        """Uploads a host array and resolves to the device array."""
+
+        return self.submit(DeviceNdArray.from_numpy, array)
+
+    def read_back(self, device_array: DeviceNdArray) -> Future:
+        """Resolves to a host copy of a device array."""
+
+        return self.submit(self._read_back, device_array)
+
+    def release(self, *resources) -> Future:
+        """Releases device arrays or other resources on the owner thread."""
+
+        return self.submit(self._release, *resources)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops accepting jobs, runs those already queued and destroys the
+        runtime."""
+
+        with self._lock:
+            if not self._shutdown:
+                self._shutdown = True
+                self._queue.put(None)
+
+        if wait:
+            self._thread.join()
+
+    @staticmethod
+    def _launch(ti_runtime: Runtime, kernel: Kernel, *args) -> None:
+        kernel.launch(ti_runtime, *args)
+
+    @staticmethod
+    def _launch_and_read_back(ti_runtime: Runtime, kernel: Kernel, *args) -> List[Any]:
+        arena = kernel.launch_detached(ti_runtime, *args)
+
+        with arena:
+            return arena.read_back()
+
+    @staticmethod
+    def _read_back(ti_runtime: Runtime, device_array: DeviceNdArray) -> np.ndarray:
+        return device_array.to_numpy()
+
+    @staticmethod
+    def _release(ti_runtime: Runtime, *resources) -> None:
+        for resource in resources:
+            resource.release()
+
+    def _run(self, started: Future) -> None:
+        try:
+            self._runtime = Runtime(self.arch, self.device)
+        except BaseException as error:
+            started.set_exception(error)
+            return
+
+        started.set_result(None)
+
+        stopping = False
+        while not stopping:
+            jobs = [self._queue.get()]
+            while len(jobs) < self.max_batch:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = self._run_batch(jobs)
+
+        self._runtime.wait()
+        self._runtime.destroy()
+
+    def _run_batch(self, jobs: list) -> bool:
+        """Runs a batch of jobs in one submission and resolves their
+        futures once it is flushed. Returns whether shutdown was asked."""
+
+        stopping, completed = False, []
+
+        try:
+            with self._runtime.batch():
+                for job in jobs:
+                    if job is None:
+                        stopping = True
+                        continue
+
+                    future, func, args, kwargs = job
+                    if not future.set_running_or_notify_cancel():
+                        continue
+
+                    try:
+                        completed.append((future, func(self._runtime, *args, **kwargs)))
+                    except BaseException as error:
+                        future.set_exception(error)
+
+        except BaseException as error:
+            for future, _ in completed:
+                future.set_exception(error)
+
+            return stopping
+
+        for future, result in completed:
+            future.set_result(result)
+
+        return stopping
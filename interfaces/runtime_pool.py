@@ -0,0 +1,296 @@
+import multiprocessing
+import queue
+from concurrent.futures import Future
+from itertools import count
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock, Thread
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from taichiAOT.c_api import *
+from .aot_module import AotModule
+from .runtime import Runtime
+
+_ALIGNMENT = 64
+
+# Seconds the collector blocks on the result queue before it checks
+# whether the workers are still alive.
+_POLL_INTERVAL = 0.1
+
+# Launch arguments travel as ('ndarray', offset, shape, dtype) into the
+# shared memory block of the launch, or as ('scalar', value).
+_NDARRAY = 'ndarray'
+_SCALAR = 'scalar'
+
+
+def _layout(args) -> Tuple[list, int]:
+    arguments, size = [], 0
+    for arg in args:
+        if isinstance(arg, np.ndarray):
+            arguments.append((_NDARRAY, size, arg.shape, arg.dtype.str))
+            size += -(-arg.nbytes // _ALIGNMENT) * _ALIGNMENT
+        else:
+            arguments.append((_SCALAR, arg))
+
+    return arguments, size
+
+
+def _views(shared_memory: SharedMemory, arguments: list) -> List[np.ndarray]:
+    return [np.ndarray(argument[2], dtype=argument[3], buffer=shared_memory.buf,
+                       offset=argument[1])
+            for argument in arguments if argument[0] == _NDARRAY]
+
+
+def _worker_main(module_path: str, arch: TiArch, device: int, tasks, results,
+                 initializer: Optional[Callable], initargs: tuple) -> None:
+    try:
+        if initializer is not None:
+            initializer(*initargs)
+
+        ti_runtime = Runtime(arch, device)
+        aot_module = AotModule.load(ti_runtime, module_path, preload=True)
+    except BaseException as error:
+        results.put((None, f"{type(error).__name__}: {error}"))
+        return
+
+    results.put((None, None))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+
+        task_id, kernel_name, shared_memory_name, arguments = task
+        shared_memory = SharedMemory(shared_memory_name) if shared_memory_name else None
+        views = ndarrays = args = arena = None
+        try:
+            views = _views(shared_memory, arguments) if shared_memory else []
+            ndarrays = iter(views)
+            args = [next(ndarrays) if argument[0] == _NDARRAY else argument[1]
+                    for argument in arguments]
+
+            kernel = aot_module.get_kernel(kernel_name)
+            arena = kernel.launch_detached(ti_runtime, *args)
+            with arena:
+                arena.read_back(out=views)
+
+            results.put((task_id, None))
+        except BaseException as error:
+            results.put((task_id, f"{type(error).__name__}: {error}"))
+        finally:
+            views = ndarrays = args = arena = None
+            if shared_memory is not None:
+                shared_memory.close()
+
+    aot_module.destroy()
+    ti_runtime.destroy()
+
+
+class RuntimePool:
+    """A pool of worker processes, each with its own runtime and a copy of
+    one AOT module, for scaling launches across cores.
+
+    NumPy arguments are copied into a shared memory block per launch, which
+    the worker uploads from and reads the ndarray arguments back into, so
+    array data is never pickled. Each launch returns a
+    `concurrent.futures.Future` resolving to the read back ndarray
+    arguments, like :meth:`RuntimeExecutor.launch_and_read_back`.
+
+    Workers are spawned rather than forked by default, since a runtime
+    must not be inherited. The C-API backend and library path are set up
+    again in each worker, through the environment or `initializer`.
+
+    A worker that does not start within `startup_timeout` seconds fails
+    the constructor. A worker that dies later fails its outstanding
+    launches, and no new launches are sent to it.
+    """
+
+    def __init__(self, module_path: str, processes: Optional[int] = None,
+                 arch: TiArch = TiArch.TI_ARCH_X64, device: int = 0,
+                 initializer: Optional[Callable] = None, initargs: tuple = (),
+                 start_method: str = 'spawn', startup_timeout: float = 60.0):
+        context = multiprocessing.get_context(start_method)
+        self._results = context.Queue()
+        self._tasks = [context.SimpleQueue()
+                       for _ in range(processes or multiprocessing.cpu_count())]
+        self._outstanding: List[int] = [0] * len(self._tasks)
+        self._dead: List[bool] = [False] * len(self._tasks)
+        self._pending: Dict[int, Tuple[Future, int, Optional[SharedMemory], list]] = {}
+        self._task_ids = count()
+        self._lock = Lock()
+        self._shutdown = False
+
+        self._processes = [context.Process(
+            target=_worker_main, daemon=True, name=f'taichi-runtime-worker-{index}',
+            args=(module_path, arch, device, tasks, self._results, initializer, initargs))
+            for index, tasks in enumerate(self._tasks)]
+        for process in self._processes:
+            process.start()
+
+        error = self._handshake(startup_timeout)
+        if error is not None:
+            for process in self._processes:
+                process.kill()
+            self._stop()
+            raise RuntimeError(f"Failed to start runtime workers: {error}")
+
+        self._collector = Thread(target=self._collect, daemon=True,
+                                 name='taichi-runtime-pool-collector')
+        self._collector.start()
+
+    def __enter__(self) -> 'RuntimePool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
+
+    @property
+    def processes(self) -> int:
+        return len(self._processes)
+
+    def _handshake(self, timeout: float) -> Optional[str]:
+        deadline, started = monotonic() + timeout, 0
+        while started < len(self._processes):
+            try:
+                _, error = self._results.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                exited = [process for process in self._processes if process.exitcode is not None]
+                if exited:
+                    return f"{exited[0].name} exited with code {exited[0].exitcode}."
+                if monotonic() >= deadline:
+                    return f"Timed out after {timeout} seconds."
+                continue
+
+            if error:
+                return error
+
+            started += 1
+
+        return None
+
+    def launch(self, kernel_name: str, *args) -> Future:
+        """Launches a kernel of the module on the least busy worker."""
+
+        arguments, size = _layout(args)
+        shared_memory = SharedMemory(create=True, size=size) if size else None
+        if shared_memory is not None:
+            for view, arg in zip(_views(shared_memory, arguments),
+                                 (arg for arg in args if isinstance(arg, np.ndarray))):
+                np.copyto(view, arg)
+
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                self._unlink(shared_memory)
+                raise RuntimeError("Cannot launch after the pool was shut down.")
+
+            alive = [index for index, dead in enumerate(self._dead) if not dead]
+            if not alive:
+                self._unlink(shared_memory)
+                raise RuntimeError("All runtime workers exited.")
+
+            worker = min(alive, key=self._outstanding.__getitem__)
+            task_id = next(self._task_ids)
+            self._outstanding[worker] += 1
+            self._pending[task_id] = (future, worker, shared_memory, arguments)
+            self._tasks[worker].put((task_id, kernel_name,
+                                     shared_memory.name if shared_memory else None,
+                                     arguments))
+
+        return future
+
+    def map(self, kernel_name: str, iterable) -> List[Future]:
+        """Launches a kernel once per argument tuple of `iterable`."""
+
+        return [self.launch(kernel_name, *args) for args in iterable]
+
+    @staticmethod
+    def _unlink(shared_memory: Optional[SharedMemory]) -> None:
+        if shared_memory is not None:
+            shared_memory.close()
+            shared_memory.unlink()
+
+    def _collect(self) -> None:
+        while True:
+            try:
+                task_id, error = self._results.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                self._reap()
+                continue
+
+            if task_id is None:
+                break
+
+            self._resolve(task_id, error)
+
+    def _resolve(self, task_id: int, error: Optional[str]) -> None:
+        with self._lock:
+            future, worker, shared_memory, arguments = self._pending.pop(task_id)
+            self._outstanding[worker] -= 1
+
+        if error is None:
+            outputs = [view.copy() for view in _views(shared_memory, arguments)] \
+                if shared_memory is not None else []
+            future.set_result(outputs)
+        else:
+            future.set_exception(RuntimeError(error))
+
+        self._unlink(shared_memory)
+
+    def _reap(self) -> None:
+        exited = [index for index, process in enumerate(self._processes)
+                  if not self._dead[index] and process.exitcode is not None]
+        if not exited:
+            return
+
+        # Results the workers sent before exiting are still in the queue.
+        while True:
+            try:
+                task_id, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if task_id is None:
+                self._results.put((None, None))
+                break
+
+            self._resolve(task_id, error)
+
+        with self._lock:
+            lost = []
+            for index in exited:
+                self._dead[index] = True
+                lost += [(task_id, index) for task_id, (_, worker, _, _) in self._pending.items()
+                         if worker == index]
+
+        for task_id, index in lost:
+            self._resolve(task_id, f"{self._processes[index].name} exited with code "
+                                   f"{self._processes[index].exitcode}.")
+
+    def _stop(self) -> None:
+        for tasks in self._tasks:
+            tasks.put(None)
+
+        for process in self._processes:
+            process.join()
+
+    def shutdown(self) -> None:
+        """Lets the workers finish the queued launches, then stops them."""
+
+        with self._lock:
+            if self._shutdown:
+                return
+
+            self._shutdown = True
+
+        self._stop()
+        self._results.put((None, None))
+        self._collector.join()
+
+        for future, _, shared_memory, _ in self._pending.values():
+            future.set_exception(RuntimeError("The runtime worker exited."))
+            self._unlink(shared_memory)
+
+        self._pending.clear()
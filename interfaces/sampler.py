@@ -17,7 +17,7 @@ class Sampler:
 
         sampler_instance = ti_create_sampler(ti_runtime.runtime_instance, create_info)
 
-        get_last_error()
+        get_last_error(ti_runtime=ti_runtime)
         return Sampler(ti_runtime=ti_runtime, ti_sampler=sampler_instance)
 
     def destroy(self) -> None:
@@ -0,0 +1,122 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from taichiAOT.c_api import *
+from .memory import Memory
+from .memory_pool import power_of_two_size_class
+
+
+class _StagingSlot:
+    def __init__(self):
+        self.memory: Optional[Memory] = None
+        self.wait_epoch: Optional[int] = None
+
+
+class StagingRing:
+    """A ring of host-visible staging buffers for device-local memory.
+
+    Uploads are written into the next staging buffer and copied into the
+    device-local memory on the device; readbacks take the reverse path.
+    Buffers stay persistently mapped and are reused round-robin. A buffer
+    whose copy may still be pending is only reused after a
+    :meth:`Runtime.wait`, so the runtime waits once the ring wraps around
+    without one. Transfers larger than `chunk_size` go through several
+    buffers in turn.
+    """
+
+    def __init__(self, ti_runtime, slots: int = 3,
+                 chunk_size: int = 64 * 1024 * 1024, min_size: int = 64 * 1024):
+        self._runtime = ti_runtime
+        self._slots: List[_StagingSlot] = [_StagingSlot() for _ in range(slots)]
+        self._next: int = 0
+        self.chunk_size: int = chunk_size
+        self.min_size: int = min_size
+
+    def _acquire(self, nbytes: int) -> _StagingSlot:
+        slot = self._slots[self._next]
+        self._next = (self._next + 1) % len(self._slots)
+
+        if slot.wait_epoch is not None and slot.wait_epoch == self._runtime.wait_epoch:
+            self._runtime.wait()
+
+        slot.wait_epoch = None
+        if slot.memory is None or slot.memory.size < nbytes:
+            self._release_slot(slot)
+
+            memory_allocate_info = TiMemoryAllocateInfo(
+                size=power_of_two_size_class(nbytes, self.min_size),
+                host_write=TI_TRUE,
+                host_read=TI_TRUE,
+                export_sharing=TI_FALSE,
+                usage=TiMemoryUsageFlags.TI_MEMORY_USAGE_STORAGE_BIT)
+
+            slot.memory = self._runtime.memory_pool.acquire(memory_allocate_info)
+            slot.memory.map_persistent()
+
+        return slot
+
+    def _chunks(self, nbytes: int) -> List[Tuple[int, int]]:
+        return [(start, min(self.chunk_size, nbytes - start))
+                for start in range(0, nbytes, self.chunk_size)]
+
+    def upload(self, memory: Memory, array: np.ndarray, offset: int = 0) -> None:
+        """Copies a host array into `memory` at byte `offset` through the
+        staging buffers."""
+
+        data = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+
+        for start, size in self._chunks(data.nbytes):
+            slot = self._acquire(size)
+            np.copyto(slot.memory.numpy_view(np.uint8, (size,)), data[start:start + size])
+
+            ti_copy_memory_device_to_device(self._runtime.runtime_instance,
+                                            slot.memory.slice(0, size),
+                                            memory.slice(offset + start, size))
+            self._runtime.record_launch()
+            slot.wait_epoch = self._runtime.wait_epoch
+
+    def download(self, memory: Memory, dtype, shape: Tuple[int, ...], offset: int = 0,
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Copies `shape` elements of `dtype` at byte `offset` of `memory`
+        back to the host, into `out` if given, through the staging
+        buffers."""
+
+        dtype = np.dtype(dtype)
+        host_array = out if out is not None and out.flags.c_contiguous \
+            else np.empty(shape, dtype=dtype)
+        data = host_array.reshape(-1).view(np.uint8)
+
+        chunks = self._chunks(data.nbytes)
+        for batch in range(0, len(chunks), len(self._slots)):
+            staged = []
+            for start, size in chunks[batch:batch + len(self._slots)]:
+                slot = self._acquire(size)
+                ti_copy_memory_device_to_device(self._runtime.runtime_instance,
+                                                memory.slice(offset + start, size),
+                                                slot.memory.slice(0, size))
+                self._runtime.record_launch()
+                staged.append((slot, start, size))
+
+            self._runtime.wait()
+            for slot, start, size in staged:
+                np.copyto(data[start:start + size], slot.memory.numpy_view(np.uint8, (size,)))
+
+        if out is not None and host_array is not out:
+            np.copyto(out, host_array)
+            return out
+
+        return host_array
+
+    def _release_slot(self, slot: _StagingSlot) -> None:
+        if slot.memory is not None:
+            memory, slot.memory = slot.memory, None
+            memory.unmap_persistent()
+            self._runtime.release_when_idle(memory)
+
+    def release(self) -> None:
+        """Returns the staging buffers to the runtime memory pool."""
+
+        for slot in self._slots:
+            self._release_slot(slot)
+            slot.wait_epoch = None
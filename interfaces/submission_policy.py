@@ -0,0 +1,31 @@
+class SubmissionPolicy:
+    """Decides when launches recorded on a runtime are submitted.
+
+    Args:
+        flush_every: flush after this many unsubmitted launches, 0 to disable.
+        flush_interval_ms: flush on a launch once this many milliseconds
+            passed since the last flush, 0 to disable.
+        wait_on_readback: wait for pending launches before the host maps
+            memory written by them.
+        max_pending_releases: wait once this many retired resources are
+            waiting to be released, so runtimes that only flush still
+            recycle memory, 0 to disable.
+    """
+
+    def __init__(self, flush_every: int = 0,
+                 flush_interval_ms: float = 0.0,
+                 wait_on_readback: bool = True,
+                 max_pending_releases: int = 64):
+        self.flush_every: int = flush_every
+        self.flush_interval_ms: float = flush_interval_ms
+        self.wait_on_readback: bool = wait_on_readback
+        self.max_pending_releases: int = max_pending_releases
+
+    def should_flush(self, pending_launches: int, elapsed_ms: float) -> bool:
+        """Whether a launch leaving `pending_launches` unsubmitted launches,
+        `elapsed_ms` after the last flush, triggers a flush."""
+
+        if self.flush_every and pending_launches >= self.flush_every:
+            return True
+
+        return bool(self.flush_interval_ms) and elapsed_ms >= self.flush_interval_ms
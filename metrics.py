@@ -0,0 +1,200 @@
+"""Opt-in hot-path metrics of the Python bindings.
+
+Nothing is recorded until :meth:`Metrics.enable` is called. While
+disabled, the instrumented code paths only test `metrics.enabled` and C
+calls go straight to the foreign functions.
+"""
+
+from threading import Lock
+from typing import Dict, List, Tuple
+
+LATENCY_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 5e-2, 0.1, 1.0)
+
+HOST_TO_DEVICE = 'host_to_device'
+DEVICE_TO_HOST = 'device_to_host'
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets: Tuple[float, ...] = buckets
+        self.counts: List[int] = [0] * len(buckets)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative(self) -> Dict[str, int]:
+        total, result = 0, {}
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result[repr(bound)] = total
+
+        result['+Inf'] = self.count
+        return result
+
+
+class Metrics:
+    """Per-kernel launch latency, host/device transfers, allocations and
+    per-C-function call counts."""
+
+    def __init__(self):
+        self.enabled: bool = False
+        self._lock = Lock()
+        self.reset()
+
+    def enable(self) -> None:
+        """Starts recording, including the timing of every C call."""
+
+        from .c_api.c_ti_methods import C
+
+        self.enabled = True
+        C.add_call_hook(self._record_c_call)
+
+    def disable(self) -> None:
+        """Stops recording. Recorded values are kept until :meth:`reset`."""
+
+        from .c_api.c_ti_methods import C
+
+        self.enabled = False
+        C.remove_call_hook(self._record_c_call)
+
+    def reset(self) -> None:
+        """Drops every recorded value."""
+
+        with self._lock:
+            self._launches: Dict[str, _Histogram] = {}
+            self._transfers: Dict[str, List[float]] = {
+                HOST_TO_DEVICE: [0, 0, 0.0],
+                DEVICE_TO_HOST: [0, 0, 0.0],
+            }
+            self._allocations: List[int] = [0, 0, 0]
+            self._c_calls: Dict[str, List[float]] = {}
+
+    def record_launch(self, kernel_name: str, seconds: float) -> None:
+        """Records a kernel launch, marshaling included."""
+
+        with self._lock:
+            histogram = self._launches.get(kernel_name)
+            if histogram is None:
+                histogram = self._launches[kernel_name] = _Histogram(LATENCY_BUCKETS)
+
+            histogram.observe(seconds)
+
+    def record_transfer(self, direction: str, nbytes: int, seconds: float) -> None:
+        """Records a host-to-device or device-to-host copy."""
+
+        with self._lock:
+            transfer = self._transfers[direction]
+            transfer[0] += 1
+            transfer[1] += nbytes
+            transfer[2] += seconds
+
+    def record_allocation(self, nbytes: int) -> None:
+        with self._lock:
+            self._allocations[0] += 1
+            self._allocations[2] += nbytes
+
+    def record_free(self) -> None:
+        with self._lock:
+            self._allocations[1] += 1
+
+    def _record_c_call(self, method_name: str, start_ns: int, end_ns: int) -> None:
+        with self._lock:
+            call = self._c_calls.get(method_name)
+            if call is None:
+                call = self._c_calls[method_name] = [0, 0.0]
+
+            call[0] += 1
+            call[1] += (end_ns - start_ns) / 1e9
+
+    def snapshot(self) -> dict:
+        """Gets a copy of the recorded values as plain dictionaries."""
+
+        with self._lock:
+            return {
+                'kernels': {
+                    name: {
+                        'launches': histogram.count,
+                        'latency_seconds_sum': histogram.sum,
+                        'latency_seconds_buckets': histogram.cumulative(),
+                    } for name, histogram in self._launches.items()
+                },
+                'transfers': {
+                    direction: {
+                        'count': count,
+                        'bytes': nbytes,
+                        'seconds': seconds,
+                        'bytes_per_second': nbytes / seconds if seconds else 0.0,
+                    } for direction, (count, nbytes, seconds) in self._transfers.items()
+                },
+                'allocations': {
+                    'allocated': self._allocations[0],
+                    'freed': self._allocations[1],
+                    'allocated_bytes': self._allocations[2],
+                },
+                'c_calls': {
+                    name: {'count': count, 'seconds': seconds}
+                    for name, (count, seconds) in self._c_calls.items()
+                },
+            }
+
+    def prometheus(self) -> str:
+        """Dumps the recorded values in the Prometheus text format."""
+
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        metric('taichi_kernel_launch_seconds', 'histogram',
+               'Kernel launch latency including argument marshaling.')
+        for name, kernel in snapshot['kernels'].items():
+            for bound, count in kernel['latency_seconds_buckets'].items():
+                lines.append(f'taichi_kernel_launch_seconds_bucket'
+                             f'{{kernel="{name}",le="{bound}"}} {count}')
+            lines.append(f'taichi_kernel_launch_seconds_sum{{kernel="{name}"}} '
+                         f'{kernel["latency_seconds_sum"]}')
+            lines.append(f'taichi_kernel_launch_seconds_count{{kernel="{name}"}} '
+                         f'{kernel["launches"]}')
+
+        metric('taichi_transfer_bytes_total', 'counter',
+               'Bytes copied between host and device.')
+        for direction, transfer in snapshot['transfers'].items():
+            lines.append(f'taichi_transfer_bytes_total{{direction="{direction}"}} '
+                         f'{transfer["bytes"]}')
+
+        metric('taichi_transfer_seconds_total', 'counter',
+               'Time spent copying between host and device.')
+        for direction, transfer in snapshot['transfers'].items():
+            lines.append(f'taichi_transfer_seconds_total{{direction="{direction}"}} '
+                         f'{transfer["seconds"]}')
+
+        metric('taichi_memory_allocations_total', 'counter', 'Device memory allocations.')
+        lines.append(f'taichi_memory_allocations_total {snapshot["allocations"]["allocated"]}')
+        metric('taichi_memory_frees_total', 'counter', 'Device memory frees.')
+        lines.append(f'taichi_memory_frees_total {snapshot["allocations"]["freed"]}')
+        metric('taichi_memory_allocated_bytes_total', 'counter', 'Bytes of device memory allocated.')
+        lines.append(f'taichi_memory_allocated_bytes_total '
+                     f'{snapshot["allocations"]["allocated_bytes"]}')
+
+        metric('taichi_c_calls_total', 'counter', 'Taichi C-API calls.')
+        for name, call in snapshot['c_calls'].items():
+            lines.append(f'taichi_c_calls_total{{function="{name}"}} {call["count"]}')
+
+        metric('taichi_c_call_seconds_total', 'counter', 'Time spent in Taichi C-API calls.')
+        for name, call in snapshot['c_calls'].items():
+            lines.append(f'taichi_c_call_seconds_total{{function="{name}"}} {call["seconds"]}')
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
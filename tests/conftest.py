@@ -0,0 +1,90 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_package() -> None:
+    # The checkout is imported as `taichiAOT`, whatever its directory name.
+    # A symlink on sys.path and PYTHONPATH lets spawned worker processes
+    # import it by name as well.
+    try:
+        import taichiAOT  # noqa: F401
+        return
+    except ImportError:
+        pass
+
+    directory = tempfile.mkdtemp(prefix='taichiAOT-tests-')
+    os.symlink(_ROOT, os.path.join(directory, 'taichiAOT'), target_is_directory=True)
+    sys.path.insert(0, directory)
+    os.environ['PYTHONPATH'] = os.pathsep.join(
+        [directory] + [path for path in [os.environ.get('PYTHONPATH')] if path])
+
+    import taichiAOT  # noqa: F401
+
+
+_import_package()
+
+from taichiAOT._utils import use_native_backend, use_simulated_backend  # noqa: E402
+from taichiAOT.c_api import TiArch  # noqa: E402
+from taichiAOT.interfaces import AotModule, Runtime  # noqa: E402
+
+
+@pytest.fixture
+def backend():
+    """A fresh simulated C-API backend, replaced by the native one after
+    the test."""
+
+    simulated_backend = use_simulated_backend()
+    yield simulated_backend
+    use_native_backend()
+
+
+@pytest.fixture
+def runtime(backend):
+    ti_runtime = Runtime(TiArch.TI_ARCH_X64)
+    yield ti_runtime
+    if ti_runtime.arch is not None:
+        ti_runtime.destroy()
+
+
+@pytest.fixture
+def module_path(tmp_path):
+    """An AOT module directory; the simulated backend only checks that it
+    exists."""
+
+    path = tmp_path / 'module'
+    path.mkdir()
+    return str(path)
+
+
+@pytest.fixture
+def aot_module(runtime, module_path):
+    return AotModule.load(runtime, module_path)
+
+
+@pytest.fixture
+def kernel(backend, aot_module):
+    """A kernel `scale(x, k)` multiplying the ndarray `x` by `k` in place."""
+
+    backend.register_kernel('scale', lambda x, k: x.__imul__(k))
+    return aot_module.get_kernel('scale')
+
+
+@pytest.fixture
+def calls():
+    """The names of the C calls made during the test, in order."""
+
+    from taichiAOT.c_api import C
+
+    names = []
+
+    def hook(method_name, start_ns, end_ns):
+        names.append(method_name)
+
+    C.add_call_hook(hook)
+    yield names
+    C.remove_call_hook(hook)
@@ -0,0 +1,91 @@
+import json
+import os
+from ctypes import c_void_p
+
+import numpy as np
+import pytest
+
+from taichiAOT.interfaces import AotModule, ComputeGraph, Kernel
+
+
+def test_kernel_handles_are_fetched_once(aot_module, calls):
+    first = aot_module.get_kernel('scale')
+    second = aot_module.get_kernel('scale')
+
+    assert calls.count('ti_get_aot_module_kernel') == 1
+    assert isinstance(first, Kernel) and first.name == 'scale'
+    assert first._kernel is second._kernel
+
+
+def test_every_lookup_gets_its_own_kernel_history(runtime, kernel, aot_module):
+    other = aot_module.kernels['scale']
+    assert other is not kernel
+
+    kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+
+    assert len(kernel.history) == 1
+    assert not other.history
+    assert other.get_arguments() == []
+
+
+def test_every_lookup_gets_its_own_compute_graph(aot_module, calls):
+    first = aot_module.get_compute_graph('graph')
+    second = aot_module.compute_graphs['graph']
+
+    assert calls.count('ti_get_aot_module_compute_graph') == 1
+    assert isinstance(first, ComputeGraph) and first is not second
+    assert first._compute_graph is second._compute_graph
+
+
+def test_load_indexes_the_module_metadata(runtime, module_path, calls):
+    with open(os.path.join(module_path, 'metadata.json'), 'w') as file:
+        json.dump({'kernels': [{'name': 'scale'}, {'name': 'add'}]}, file)
+    with open(os.path.join(module_path, 'graphs.json'), 'w') as file:
+        json.dump({'graphs': {'graph': {}}}, file)
+
+    aot_module = AotModule.load(runtime, module_path)
+
+    assert list(aot_module.kernels) == ['scale', 'add']
+    assert 'graph' in aot_module.compute_graphs
+    assert 'ti_get_aot_module_kernel' not in calls
+
+
+def test_preload_fetches_every_indexed_handle(runtime, module_path, calls):
+    with open(os.path.join(module_path, 'metadata.json'), 'w') as file:
+        json.dump({'kernels': [{'name': 'scale'}, {'name': 'add'}]}, file)
+
+    AotModule.load(runtime, module_path, preload=True)
+
+    assert calls.count('ti_get_aot_module_kernel') == 2
+
+
+def test_clear_refetches_the_handles(aot_module, calls):
+    aot_module.get_kernel('scale')
+
+    aot_module.kernels.clear()
+    aot_module.get_kernel('scale')
+
+    assert calls.count('ti_get_aot_module_kernel') == 2
+
+
+def test_create_from_a_buffer(runtime):
+    aot_module = AotModule.create(runtime, b'\x00' * 16)
+
+    assert isinstance(aot_module.get_kernel('scale'), Kernel)
+
+
+def test_create_from_a_path_memory_maps_the_file(runtime, tmp_path):
+    path = tmp_path / 'module.tcm'
+    path.write_bytes(b'\x00' * 16)
+
+    assert isinstance(AotModule.create(runtime, str(path)), AotModule)
+
+
+def test_create_rejects_a_size_past_the_buffer(runtime):
+    with pytest.raises(ValueError):
+        AotModule.create(runtime, bytearray(16), size=17)
+
+
+def test_create_from_a_pointer_requires_the_size(runtime):
+    with pytest.raises(ValueError):
+        AotModule.create(runtime, c_void_p(1))
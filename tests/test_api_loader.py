@@ -0,0 +1,55 @@
+import pytest
+
+from taichiAOT.c_api._api_loader import C_API
+from taichiAOT.c_api.exceptions import MissingTaichiLibraryException, TaichiException
+from taichiAOT.c_api.simulated_backend import SimulatedBackend
+
+
+def test_construction_does_not_load_the_library(tmp_path):
+    api = C_API(library_path=str(tmp_path / 'missing.so'))
+
+    assert not api.loaded
+
+    with pytest.raises(MissingTaichiLibraryException):
+        api.ti_get_version
+
+
+def test_library_path_environment_override(tmp_path, monkeypatch):
+    monkeypatch.setenv(C_API.LIBRARY_PATH_ENV, str(tmp_path))
+    api = C_API()
+
+    with pytest.raises(MissingTaichiLibraryException, match=str(tmp_path)):
+        api.ti_get_version
+
+
+def test_only_the_requested_methods_are_bound():
+    api = C_API(backend=SimulatedBackend())
+
+    api.ti_wait
+
+    assert api.loaded
+    assert 'ti_wait' in vars(api)
+    assert 'ti_flush' not in vars(api)
+
+
+def test_unknown_methods_are_attribute_errors():
+    api = C_API(backend=SimulatedBackend())
+
+    assert not hasattr(api, 'ti_no_such_method')
+
+
+def test_library_path_is_fixed_once_loaded():
+    api = C_API(backend=SimulatedBackend())
+    api.ti_wait
+
+    with pytest.raises(TaichiException):
+        api.set_library_path('libtaichi_c_api.so')
+
+
+def test_backend_environment_selects_the_simulated_backend(monkeypatch):
+    monkeypatch.setenv(C_API.BACKEND_ENV, 'simulated')
+    api = C_API()
+
+    api.ti_get_version
+
+    assert isinstance(api.backend, SimulatedBackend)
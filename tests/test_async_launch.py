@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import numpy as np
+
+
+def test_launch_async_resolves_to_the_read_back_arguments(runtime, kernel):
+    async def main():
+        return await kernel.launch_async(runtime, np.arange(4, dtype=np.float32), 2.0)
+
+    result = asyncio.run(main())
+
+    np.testing.assert_array_equal(result[0], [0, 2, 4, 6])
+    assert not kernel.history
+    assert runtime.idle
+
+
+def test_launch_async_runs_on_the_runtime_executor_thread(backend, runtime, kernel, calls):
+    threads = {}
+    backend.register_kernel('scale', lambda x, k: threads.setdefault(
+        'launch', threading.current_thread().name))
+
+    async def main():
+        await kernel.launch_async(runtime, np.ones(4, np.float32), 2.0)
+
+    asyncio.run(main())
+
+    assert threads['launch'].startswith('taichi-runtime-')
+
+
+def test_wait_async_does_not_block_the_event_loop(backend, runtime, kernel):
+    backend.set_latency('ti_wait', 0.05)
+    ticks = []
+
+    async def ticker():
+        for _ in range(3):
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+        await asyncio.gather(runtime.wait_async(), ticker())
+
+    asyncio.run(main())
+
+    assert len(ticks) == 3
+    assert runtime.idle
+
+
+def test_concurrent_async_launches_keep_their_arguments_apart(runtime, kernel):
+    async def main():
+        return await asyncio.gather(*[
+            kernel.launch_async(runtime, np.full(4, value, np.float32), 2.0)
+            for value in range(8)])
+
+    results = asyncio.run(main())
+
+    for value, result in enumerate(results):
+        np.testing.assert_array_equal(result[0], np.full(4, 2.0 * value))
+
+
+def test_launches_from_threads_share_the_locked_history(runtime, kernel):
+    kernel.history_size = 64
+
+    def launch():
+        for _ in range(8):
+            kernel.set_arguments(runtime, np.ones(4, np.float32), 2.0)
+
+    threads = [threading.Thread(target=launch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(kernel.history) == 32
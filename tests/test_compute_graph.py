@@ -0,0 +1,59 @@
+from ctypes import addressof
+
+import numpy as np
+import pytest
+
+from taichiAOT.interfaces import AotModule
+
+
+@pytest.fixture
+def graph(backend, runtime, module_path):
+    backend.register_compute_graph('scale', lambda x, k: x.__imul__(k))
+    return AotModule.load(runtime, module_path).get_compute_graph('scale')
+
+
+def test_launch_by_name(runtime, graph):
+    graph.launch(runtime, x=np.arange(4, dtype=np.float32), k=2.0)
+
+    np.testing.assert_array_equal(graph.get_arguments()['x'], [0, 2, 4, 6])
+
+
+def test_busy_relaunch_swaps_in_a_fresh_block(runtime, graph, calls):
+    graph.launch(runtime, x=np.arange(4, dtype=np.float32), k=2.0)
+    memory = graph._table.arguments[0].memory
+    calls.clear()
+
+    graph.launch(runtime, x=np.arange(4, dtype=np.float32), k=3.0)
+
+    assert 'ti_wait' not in calls
+    assert graph._table.arguments[0].memory is not memory
+    bound = graph._table.ti_named_arguments[0].argument.value.ndarray.memory
+    assert addressof(bound.contents) \
+        == addressof(graph._table.arguments[0].memory.memory_instance.contents)
+    np.testing.assert_array_equal(graph.get_arguments()['x'], [0, 3, 6, 9])
+
+
+def test_idle_relaunch_reuploads_in_place(runtime, graph, calls):
+    graph.launch(runtime, x=np.arange(4, dtype=np.float32), k=2.0)
+    runtime.wait()
+    memory = graph._table.arguments[0].memory
+    calls.clear()
+
+    graph.launch(runtime, x=np.arange(4, dtype=np.float32), k=3.0)
+
+    assert [name for name in calls
+            if name in ('ti_map_memory', 'ti_launch_compute_graph', 'ti_wait')] \
+        == ['ti_map_memory', 'ti_launch_compute_graph']
+    assert graph._table.arguments[0].memory is memory
+    np.testing.assert_array_equal(graph.get_arguments()['x'], [0, 3, 6, 9])
+
+
+def test_new_names_rebuild_the_table(runtime, graph, backend):
+    backend.register_compute_graph('scale', lambda **kwargs: None)
+    graph.launch(runtime, x=np.ones(4, np.float32), k=2.0)
+    table = graph._table
+
+    graph.launch(runtime, y=np.ones(4, np.float32))
+
+    assert graph._table is not table
+    assert list(graph.get_arguments()) == ['y']
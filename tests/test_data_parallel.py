@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from taichiAOT.c_api import TiArch
+from taichiAOT.interfaces import DataParallel, Runtime
+from taichiAOT.interfaces.module_cache import module_cache
+
+
+@pytest.fixture
+def runtimes(backend):
+    ti_runtimes = [Runtime(TiArch.TI_ARCH_X64) for _ in range(2)]
+    yield ti_runtimes
+    for ti_runtime in ti_runtimes:
+        ti_runtime.destroy()
+
+
+@pytest.fixture
+def data_parallel(backend, runtimes, module_path):
+    backend.register_kernel('scale', lambda x, k: x.__imul__(k))
+    with DataParallel.load(runtimes, module_path, 'scale') as loaded:
+        yield loaded
+
+
+def _simulate(data_parallel, overhead, costs, length=1000, launches=20):
+    """Feeds launch times of `overhead + elements * cost` per runtime back
+    and returns the resulting splits."""
+
+    splits = []
+    for _ in range(launches):
+        sizes = data_parallel.shard_sizes(length)
+        for index, (size, cost) in enumerate(zip(sizes, costs)):
+            data_parallel._record(index, size, overhead + size * cost)
+        splits.append(data_parallel.shard_sizes(length))
+
+    return splits
+
+
+def test_launch_splits_and_gathers(data_parallel):
+    array = np.arange(10, dtype=np.float32)
+
+    outputs = data_parallel.launch(array, 2.0)
+
+    np.testing.assert_array_equal(outputs[0], array * 2)
+
+
+def test_launch_splits_along_axis(backend, runtimes, module_path):
+    backend.register_kernel('scale', lambda x, k: x.__imul__(k))
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+    with DataParallel.load(runtimes, module_path, 'scale', axis=1) as data_parallel:
+        outputs = data_parallel.launch(array, 3.0)
+
+    np.testing.assert_array_equal(outputs[0], array * 3)
+
+
+def test_mismatched_lengths_are_rejected(data_parallel):
+    with pytest.raises(ValueError):
+        data_parallel.launch(np.ones(4, np.float32), np.ones(5, np.float32))
+
+
+def test_shard_sizes_add_up(data_parallel):
+    data_parallel.throughput = [1.0, 2.0]
+
+    assert sum(data_parallel.shard_sizes(1001)) == 1001
+    assert data_parallel.shard_sizes(3) == [1, 2]
+
+
+def test_launch_overhead_does_not_skew_identical_runtimes(data_parallel):
+    # An uneven first split must not feed on itself through the overhead.
+    data_parallel.throughput = [1.0, 2.0]
+
+    splits = _simulate(data_parallel, overhead=5e-3, costs=[1e-5, 1e-5])
+
+    assert all(abs(split[0] - 500) <= 10 for split in splits[-5:])
+
+
+def test_faster_runtime_gets_the_larger_shard(data_parallel):
+    splits = _simulate(data_parallel, overhead=5e-3, costs=[1e-5, 3e-5])
+
+    assert abs(splits[-1][0] - 750) <= 10
+
+
+def test_weights_are_clamped_toward_equal_shares(data_parallel):
+    data_parallel.throughput = [1.0, 1000.0]
+
+    weights = data_parallel.weights()
+
+    assert weights[1] / weights[0] <= data_parallel.max_imbalance * len(weights)
+    assert sum(weights) == pytest.approx(1.0)
+
+
+def test_release_drops_the_module_references(backend, runtimes, module_path):
+    data_parallel = DataParallel.load(runtimes, module_path, 'scale')
+    references = module_cache.stats()['references']
+
+    data_parallel.release()
+    data_parallel.release()
+
+    assert module_cache.stats()['references'] == references - len(runtimes)
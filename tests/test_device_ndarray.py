@@ -0,0 +1,82 @@
+import gc
+
+import numpy as np
+import pytest
+
+from taichiAOT.interfaces import DeviceNdArray
+
+
+def test_round_trip(runtime):
+    array = np.arange(6, dtype=np.float32).reshape(2, 3)
+
+    device_array = DeviceNdArray.from_numpy(runtime, array)
+
+    assert device_array.shape == (2, 3)
+    assert device_array.nbytes == array.nbytes
+    np.testing.assert_array_equal(device_array.to_numpy(), array)
+
+
+def test_chained_launches_stay_on_the_device(runtime, kernel, calls):
+    device_array = DeviceNdArray.from_numpy(runtime, np.ones(4, np.float32))
+    calls.clear()
+
+    kernel.launch(runtime, device_array, 2.0)
+    kernel.launch(runtime, device_array, 3.0)
+
+    assert 'ti_allocate_memory' not in calls
+    assert 'ti_map_memory' not in calls
+    np.testing.assert_array_equal(device_array.to_numpy(), np.full(4, 6.0))
+
+
+def test_clone_copies_on_the_device(runtime, calls):
+    device_array = DeviceNdArray.from_numpy(runtime, np.arange(4, dtype=np.float32))
+    calls.clear()
+
+    clone = device_array.clone()
+
+    assert 'ti_copy_memory_device_to_device' in calls
+    np.testing.assert_array_equal(clone.to_numpy(), [0, 1, 2, 3])
+
+
+def test_upload_rejects_another_shape(runtime):
+    device_array = DeviceNdArray.empty(runtime, (4,), np.float32)
+
+    with pytest.raises(ValueError):
+        device_array.upload(np.ones(5, np.float32))
+
+
+def test_released_array_cannot_be_read(runtime):
+    device_array = DeviceNdArray.from_numpy(runtime, np.ones(4, np.float32))
+
+    device_array.release()
+
+    assert device_array.memory is None
+    with pytest.raises(RuntimeError):
+        device_array.to_numpy()
+
+
+def test_finalizer_only_queues_the_memory(runtime, kernel, calls):
+    device_array = DeviceNdArray.from_numpy(runtime, np.ones(4, np.float32))
+    kernel.launch(runtime, device_array, 2.0)
+    kernel.history.clear()
+    calls.clear()
+
+    del device_array
+    gc.collect()
+
+    assert calls == []
+    assert runtime.memory_pool.stats()['idle_blocks'] == 0
+
+    runtime.wait()
+    assert runtime.memory_pool.stats()['idle_blocks'] == 1
+
+
+def test_finalized_memory_of_an_idle_runtime_is_released_on_the_next_wait(runtime):
+    device_array = DeviceNdArray.from_numpy(runtime, np.ones(4, np.float32))
+
+    del device_array
+    gc.collect()
+    assert runtime.memory_pool.stats()['idle_blocks'] == 0
+
+    runtime.wait()
+    assert runtime.memory_pool.stats()['idle_blocks'] == 1
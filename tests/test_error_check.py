@@ -0,0 +1,68 @@
+import pytest
+
+from taichiAOT._utils import get_error_check_mode, get_last_error, set_error_check_mode
+from taichiAOT.c_api import TiError, ti_set_last_error
+
+
+@pytest.fixture
+def failed(backend):
+    """Leaves a C API error behind, as a failed C call would."""
+
+    ti_set_last_error(TiError.TI_ERROR_INVALID_ARGUMENT, 'invalid argument')
+    yield
+    ti_set_last_error(TiError.TI_ERROR_SUCCESS, '')
+
+
+@pytest.fixture(autouse=True)
+def global_mode():
+    yield
+    set_error_check_mode('always')
+
+
+def test_always_raises_the_last_error(runtime, failed):
+    with pytest.raises(RuntimeError, match='invalid argument'):
+        get_last_error(ti_runtime=runtime)
+
+
+def test_debug_raises_after_checking_only_the_code(runtime, failed):
+    runtime.error_check_mode = 'debug'
+
+    with pytest.raises(RuntimeError, match='invalid argument'):
+        get_last_error(ti_runtime=runtime)
+
+
+def test_debug_skips_the_message_on_success(runtime, calls):
+    runtime.error_check_mode = 'debug'
+
+    get_last_error(ti_runtime=runtime)
+
+    assert calls == ['ti_get_last_error']
+
+
+@pytest.mark.parametrize('mode', ['deferred', 'off'])
+def test_deferred_and_off_do_not_check_per_call(runtime, failed, calls, mode):
+    runtime.error_check_mode = mode
+
+    assert get_last_error(ti_runtime=runtime) == ''
+    assert calls == []
+
+
+def test_deferred_checks_on_flush_and_wait(runtime, failed):
+    runtime.error_check_mode = 'deferred'
+
+    with pytest.raises(RuntimeError, match='invalid argument'):
+        runtime.flush()
+
+
+def test_runtime_mode_overrides_the_global_one(runtime):
+    set_error_check_mode('off')
+    assert get_error_check_mode() == 'off'
+    assert get_error_check_mode(runtime) == 'off'
+
+    runtime.error_check_mode = 'debug'
+    assert get_error_check_mode(runtime) == 'debug'
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        set_error_check_mode('sometimes')
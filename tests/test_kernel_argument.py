@@ -0,0 +1,67 @@
+from ctypes import sizeof
+
+import numpy as np
+import pytest
+
+from taichiAOT.interfaces import DeviceNdArray
+from taichiAOT.interfaces._type_maps import get_ctypes_data_type
+
+
+def _launch(runtime, kernel, array):
+    kernel.launch(runtime, array, 2.0)
+    return np.asarray(kernel.get_arguments()[0])
+
+
+@pytest.mark.parametrize('array', [
+    np.arange(12, dtype=np.float32).reshape(3, 4).T,
+    np.asfortranarray(np.arange(12, dtype=np.float32).reshape(3, 4)),
+    np.arange(24, dtype=np.float32)[::2],
+    np.arange(24, dtype=np.float32).reshape(4, 6)[1:3, ::3],
+], ids=['transpose', 'fortran', 'strided', 'sliced'])
+def test_non_contiguous_arrays_are_uploaded_in_c_order(runtime, kernel, array):
+    np.testing.assert_array_equal(_launch(runtime, kernel, array), array * 2)
+
+
+def test_contiguous_upload_is_a_single_copy(runtime, kernel, calls):
+    _launch(runtime, kernel, np.ones(4, np.float32))
+
+    assert calls.count('ti_map_memory') == 2
+
+
+def test_non_contiguous_upload_does_not_copy_the_input(runtime, kernel):
+    array = np.arange(12, dtype=np.float32).reshape(3, 4).T
+    before = array.copy()
+
+    _launch(runtime, kernel, array)
+
+    np.testing.assert_array_equal(array, before)
+
+
+def test_non_contiguous_upload_through_the_staging_ring(runtime, kernel):
+    runtime.upload_mode = 'staged'
+    array = np.asfortranarray(np.arange(12, dtype=np.float32).reshape(3, 4))
+
+    np.testing.assert_array_equal(_launch(runtime, kernel, array), array * 2)
+
+
+def test_float16_arguments_use_two_byte_elements(runtime, kernel):
+    array = np.arange(8, dtype=np.float16)
+
+    kernel.launch(runtime, array, 2.0)
+
+    assert kernel.history[-1].argument_bytes() == [16, 0]
+    result = np.asarray(kernel.get_arguments()[0])
+    assert result.dtype == np.float16
+    np.testing.assert_array_equal(result, array * 2)
+
+
+def test_float16_device_arrays_round_trip(runtime):
+    array = np.linspace(-1, 1, 5, dtype=np.float16)
+    device_array = DeviceNdArray.from_numpy(runtime, array)
+
+    assert device_array.nbytes == 10
+    np.testing.assert_array_equal(device_array.to_numpy(), array)
+
+
+def test_float16_ctypes_element_is_two_bytes():
+    assert sizeof(get_ctypes_data_type(np.zeros(1, np.float16))) == 2
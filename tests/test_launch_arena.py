@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from taichiAOT.interfaces import Kernel, Runtime, SubmissionPolicy
+from taichiAOT.c_api import TiArch
+
+
+def test_history_retires_the_oldest_arena(runtime, kernel):
+    arenas = [kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+              for _ in range(kernel.history_size + 1)]
+
+    assert list(kernel.history) == arenas[1:]
+    assert not arenas[0].released
+
+    runtime.wait()
+    assert arenas[0].released
+    assert not any(arena.released for arena in arenas[1:])
+
+
+def test_retired_arenas_are_released_without_waits(runtime, kernel):
+    runtime.submission_policy = SubmissionPolicy(max_pending_releases=8)
+
+    for _ in range(200):
+        kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+        runtime.flush()
+
+    assert len(runtime._pending_releases) < 8
+    assert runtime.memory_pool.hits > runtime.memory_pool.misses
+
+
+def test_arena_retired_while_idle_is_released_at_once(runtime, kernel):
+    arena = kernel.set_arguments(runtime, np.ones(4, np.float32), 2.0)
+
+    arena.retire()
+
+    assert arena.released
+
+
+def test_read_back_releases_the_arena(runtime, kernel):
+    arena = kernel.launch(runtime, np.arange(4, dtype=np.float32), 2.0)
+
+    lazy_arrays = kernel.read_back(arena)
+
+    assert arena.released
+    assert arena not in kernel.history
+    np.testing.assert_array_equal(np.asarray(lazy_arrays[0]), [0, 2, 4, 6])
+
+
+def test_launch_detached_keeps_the_arena_out_of_the_history(runtime, kernel):
+    with kernel.launch_detached(runtime, np.arange(4, dtype=np.float32), 3.0) as arena:
+        assert arena not in kernel.history
+        np.testing.assert_array_equal(arena.read_back()[0], [0, 3, 6, 9])
+
+    assert arena.released
+
+
+def test_history_size_one_keeps_the_latest_arena(runtime, kernel):
+    kernel.history_size = 1
+    first = kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+    second = kernel.launch(runtime, np.ones(4, np.float32), 3.0)
+
+    assert list(kernel.history) == [second]
+    assert not second.released
+    np.testing.assert_array_equal(kernel.get_arguments()[0], np.full(4, 3.0))
+    assert first.released
+
+
+def test_history_size_below_one_is_rejected():
+    with pytest.raises(ValueError):
+        Kernel(None, history_size=0)
+
+
+def test_destroy_waits_for_pending_launches(backend, kernel, calls):
+    ti_runtime = Runtime(TiArch.TI_ARCH_X64)
+    kernel.launch(ti_runtime, np.ones(4, np.float32), 2.0)
+    calls.clear()
+
+    ti_runtime.destroy()
+
+    assert calls.index('ti_wait') < calls.index('ti_destroy_runtime')
+    assert 'ti_release_memory' not in calls[:calls.index('ti_wait')]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from taichiAOT.interfaces import LazyArray
+
+
+def _launch(runtime, kernel, array):
+    kernel.launch(runtime, array, 2.0)
+    return kernel.get_arguments()[0]
+
+
+def test_get_arguments_returns_lazy_arrays(runtime, kernel, calls):
+    array = _launch(runtime, kernel, np.arange(12, dtype=np.float32).reshape(4, 3))
+    calls.clear()
+
+    assert isinstance(array, LazyArray)
+    assert array.shape == (4, 3)
+    assert 'ti_map_memory' not in calls
+
+    np.testing.assert_array_equal(np.asarray(array), np.arange(12).reshape(4, 3) * 2)
+
+
+def test_get_arguments_before_any_launch_is_empty(kernel):
+    assert kernel.get_arguments() == []
+
+
+def test_get_arguments_twice_returns_the_same_launch(runtime, kernel):
+    kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+    kernel.launch(runtime, np.ones(4, np.float32), 3.0)
+
+    latest = kernel.get_arguments()
+    assert kernel.get_arguments() is latest
+    np.testing.assert_array_equal(latest[0], np.full(4, 3.0))
+    np.testing.assert_array_equal(kernel.get_arguments(-2)[0], np.full(4, 2.0))
+    assert len(kernel.history) == 2
+
+
+def test_relaunching_a_read_back_launch_is_rejected(runtime, kernel):
+    kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+    kernel.get_arguments()
+
+    with pytest.raises(RuntimeError, match='read back'):
+        kernel.launch(runtime)
+
+
+def test_integer_index_reads_back_one_row(runtime, kernel):
+    array = _launch(runtime, kernel, np.arange(12, dtype=np.float32).reshape(4, 3))
+
+    np.testing.assert_array_equal(array[2], [12, 14, 16])
+    np.testing.assert_array_equal(array[-1, 1], 20)
+    assert array._host is None
+
+
+def test_unit_step_slice_reads_back_the_selected_rows(runtime, kernel):
+    array = _launch(runtime, kernel, np.arange(12, dtype=np.float32).reshape(6, 2))
+
+    np.testing.assert_array_equal(array[1:3], [[4, 6], [8, 10]])
+    np.testing.assert_array_equal(array[4:, 0], [16, 20])
+    assert array[5:2].shape == (0, 2)
+    assert array._host is None
+
+
+def test_other_keys_read_back_and_cache_the_whole_array(runtime, kernel):
+    array = _launch(runtime, kernel, np.arange(6, dtype=np.float32))
+
+    np.testing.assert_array_equal(array[::2], [0, 4, 8])
+    assert array._host is not None
+    np.testing.assert_array_equal(array[[1, 2]], [2, 4])
+
+
+def test_out_of_bounds_index_raises(runtime, kernel):
+    array = _launch(runtime, kernel, np.arange(4, dtype=np.float32))
+
+    with pytest.raises(IndexError):
+        array[4]
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from taichiAOT.c_api import *
+from taichiAOT.interfaces import Memory
+
+
+def _allocate(runtime, size: int, host_visible=TI_TRUE) -> Memory:
+    return Memory.allocate(runtime, TiMemoryAllocateInfo(
+        size=size, host_write=host_visible, host_read=host_visible, export_sharing=TI_FALSE,
+        usage=TiMemoryUsageFlags.TI_MEMORY_USAGE_STORAGE_BIT))
+
+
+def test_numpy_view_aliases_the_memory(runtime):
+    memory = _allocate(runtime, 16)
+
+    with memory.as_numpy(np.float32, (2, 2)) as view:
+        view[:] = [[1, 2], [3, 4]]
+
+    with memory.as_numpy(np.float32, (2,), offset=8) as view:
+        np.testing.assert_array_equal(view, [3, 4])
+
+    assert not memory.mapped
+
+
+def test_view_past_the_allocation_is_rejected(runtime):
+    memory = _allocate(runtime, 16)
+
+    with pytest.raises(ValueError):
+        memory.numpy_view(np.float32, (4,), offset=4)
+
+    with pytest.raises(ValueError):
+        memory.slice(8, 16)
+
+
+def test_persistent_mapping_maps_once(runtime, calls):
+    memory = _allocate(runtime, 16)
+
+    memory.map_persistent()
+    for _ in range(3):
+        with memory.as_numpy(np.uint8):
+            pass
+
+    assert memory.mapped
+    assert calls.count('ti_map_memory') == 1
+
+    memory.unmap_persistent()
+    assert not memory.mapped
+    assert calls.count('ti_unmap_memory') == 1
+
+
+def test_device_local_memory_cannot_be_mapped_persistently(runtime):
+    memory = _allocate(runtime, 16, host_visible=TI_FALSE)
+
+    assert not memory.host_visible
+    with pytest.raises(ValueError):
+        memory.map_persistent()
+
+
+def test_write_and_read_round_trip(runtime):
+    memory = _allocate(runtime, 64)
+    array = np.arange(12, dtype=np.int32).reshape(3, 4)
+
+    memory.write(array.T, offset=8)
+
+    np.testing.assert_array_equal(memory.read(np.int32, (4, 3), offset=8), array.T)
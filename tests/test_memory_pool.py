@@ -0,0 +1,64 @@
+import numpy as np
+
+from taichiAOT.c_api import TI_FALSE, TI_TRUE, TiMemoryAllocateInfo, TiMemoryUsageFlags
+from taichiAOT.interfaces import MemoryPool
+from taichiAOT.interfaces.memory_pool import power_of_two_size_class
+
+
+def _allocate_info(size: int, host_visible=TI_TRUE) -> TiMemoryAllocateInfo:
+    return TiMemoryAllocateInfo(size=size, host_write=host_visible, host_read=host_visible,
+                                export_sharing=TI_FALSE,
+                                usage=TiMemoryUsageFlags.TI_MEMORY_USAGE_STORAGE_BIT)
+
+
+def test_size_classes_are_powers_of_two():
+    assert power_of_two_size_class(1) == 256
+    assert power_of_two_size_class(257) == 512
+    assert power_of_two_size_class(4096) == 4096
+
+
+def test_released_blocks_are_reused_by_size_class(runtime):
+    pool = MemoryPool(runtime)
+    memory = pool.acquire(_allocate_info(300))
+    memory.release()
+
+    assert pool.acquire(_allocate_info(400)) is memory
+    assert pool.stats()['hits'] == 1
+    assert pool.stats()['misses'] == 1
+
+
+def test_memory_flags_are_part_of_the_key(runtime):
+    pool = MemoryPool(runtime)
+    pool.acquire(_allocate_info(256)).release()
+
+    assert pool.acquire(_allocate_info(256, TI_FALSE)).allocate_info.host_read.value == 0
+    assert pool.stats()['misses'] == 2
+
+
+def test_idle_blocks_are_evicted_past_the_budget(runtime):
+    pool = MemoryPool(runtime, max_idle_bytes=512)
+    blocks = [pool.acquire(_allocate_info(256)) for _ in range(3)]
+
+    for block in blocks:
+        block.release()
+
+    assert pool.stats()['evictions'] == 1
+    assert pool.idle_bytes == 512
+
+
+def test_launch_arguments_are_recycled(runtime, kernel):
+    for _ in range(3):
+        arena = kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+        kernel.read_back(arena)
+        runtime.wait()
+
+    assert runtime.memory_pool.misses == 1
+
+
+def test_destroy_frees_the_idle_blocks(backend, runtime, kernel):
+    with kernel.launch(runtime, np.ones(4, np.float32), 2.0):
+        pass
+
+    runtime.destroy()
+
+    assert not backend._memories
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from taichiAOT.metrics import DEVICE_TO_HOST, HOST_TO_DEVICE, metrics
+from taichiAOT.tracing import tracer
+
+
+@pytest.fixture
+def recording(backend):
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_metrics_record_nothing(runtime, kernel):
+    metrics.reset()
+
+    kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+
+    snapshot = metrics.snapshot()
+    assert snapshot['kernels'] == {}
+    assert snapshot['c_calls'] == {}
+
+
+def test_launches_and_transfers_are_recorded(runtime, kernel, recording):
+    kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+    kernel.history[-1].read_back()
+
+    snapshot = recording.snapshot()
+    assert snapshot['kernels']['scale']['launches'] == 1
+    assert snapshot['transfers'][HOST_TO_DEVICE]['bytes'] == 16
+    assert snapshot['transfers'][DEVICE_TO_HOST]['bytes'] == 16
+    assert snapshot['c_calls']['ti_launch_kernel']['count'] == 1
+    assert snapshot['allocations']['allocated'] == 1
+
+
+def test_prepared_launches_are_recorded_under_the_kernel_name(runtime, kernel, recording):
+    prepared = kernel.prepare(runtime, np.ones(4, np.float32), 2.0)
+
+    prepared.launch()
+    prepared.launch()
+
+    assert recording.snapshot()['kernels']['scale']['launches'] == 2
+
+
+def test_one_launch_feeds_the_metrics_and_the_trace(runtime, kernel, recording):
+    tracer.clear()
+    tracer.enable()
+    try:
+        kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+    finally:
+        tracer.disable()
+
+    spans = [event for event in tracer.to_chrome_trace()['traceEvents']
+             if event.get('cat') in ('launch', 'transfer')]
+    tracer.clear()
+
+    assert [span['name'] for span in spans] == [HOST_TO_DEVICE, 'scale']
+    assert spans[1]['args'] == {'argument_bytes': [16, 0]}
+    assert recording.snapshot()['kernels']['scale']['launches'] == 1
+
+
+def test_latency_histogram_is_cumulative():
+    metrics.reset()
+    metrics.record_launch('kernel', 2e-5)
+    metrics.record_launch('kernel', 2.0)
+
+    buckets = metrics.snapshot()['kernels']['kernel']['latency_seconds_buckets']
+    metrics.reset()
+
+    assert buckets['1e-05'] == 0
+    assert buckets['2.5e-05'] == 1
+    assert buckets['1.0'] == 1
+    assert buckets['+Inf'] == 2
+
+
+def test_prometheus_export(runtime, kernel, recording):
+    kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+
+    text = recording.prometheus()
+
+    assert 'taichi_kernel_launch_seconds_count{kernel="scale"} 1' in text
+    assert 'taichi_transfer_bytes_total{direction="host_to_device"} 16' in text
+    assert 'taichi_c_calls_total{function="ti_launch_kernel"} 1' in text
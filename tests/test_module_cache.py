@@ -0,0 +1,63 @@
+import os
+import threading
+
+import pytest
+
+from taichiAOT.c_api import TiArch
+from taichiAOT.interfaces import ModuleCache, Runtime
+
+
+def test_acquire_shares_one_module(runtime, module_path):
+    cache = ModuleCache()
+
+    first = cache.acquire(runtime, module_path)
+    second = cache.acquire(runtime, module_path)
+
+    assert first is second
+    assert cache.stats() == {'modules': 1, 'references': 2}
+
+
+def test_changed_files_reload_the_module(runtime, module_path):
+    cache = ModuleCache()
+    first = cache.acquire(runtime, module_path)
+    cache.release(first)
+
+    with open(os.path.join(module_path, 'metadata.json'), 'w') as file:
+        file.write('{}')
+
+    assert cache.acquire(runtime, module_path) is not first
+    assert cache.stats()['modules'] == 1
+
+
+def test_missing_path_raises_a_runtime_error(runtime, tmp_path):
+    with pytest.raises(RuntimeError, match='TiError code'):
+        ModuleCache().acquire(runtime, str(tmp_path / 'missing'))
+
+
+def test_slow_load_does_not_block_other_runtimes(backend, module_path):
+    runtimes = [Runtime(TiArch.TI_ARCH_X64) for _ in range(2)]
+    cache = ModuleCache()
+    loading, resume = threading.Event(), threading.Event()
+    load = backend.ti_load_aot_module
+
+    def slow_load(runtime, path):
+        if threading.current_thread().name == 'slow-load':
+            loading.set()
+            resume.wait(5.0)
+        return load(runtime, path)
+
+    backend.ti_load_aot_module = slow_load
+    thread = threading.Thread(target=cache.acquire, args=(runtimes[0], module_path),
+                              name='slow-load')
+    thread.start()
+    try:
+        assert loading.wait(5.0)
+        cache.acquire(runtimes[1], module_path)
+        assert cache.stats()['modules'] == 1
+    finally:
+        resume.set()
+        thread.join()
+
+    assert cache.stats()['modules'] == 2
+    for runtime in runtimes:
+        runtime.destroy()
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from taichiAOT.interfaces import DeviceNdArray
+
+
+def _trace(calls):
+    return [name for name in calls
+            if name in ('ti_allocate_memory', 'ti_map_memory', 'ti_launch_kernel', 'ti_wait')]
+
+
+def test_relaunch_uploads_into_a_fresh_block_without_waiting(runtime, kernel, calls):
+    prepared = kernel.prepare(runtime, np.zeros(4, np.float32), 1.0)
+    prepared.launch()
+    memory = prepared.arguments[0].memory
+    calls.clear()
+
+    prepared.launch(np.arange(4, dtype=np.float32), 3.0)
+
+    assert 'ti_wait' not in calls
+    assert prepared.arguments[0].memory is not memory
+    assert runtime._pending_releases
+    np.testing.assert_array_equal(prepared.get_arguments()[0], [0, 3, 6, 9])
+
+
+def test_swapped_blocks_are_recycled_after_a_wait(runtime, kernel, calls):
+    prepared = kernel.prepare(runtime, np.zeros(4, np.float32), 1.0)
+    prepared.launch()
+    prepared.launch(np.ones(4, np.float32), 2.0)
+    runtime.wait()
+    misses = runtime.memory_pool.misses
+
+    prepared.launch()
+    prepared.launch(np.full(4, 3.0, np.float32), 2.0)
+
+    assert runtime.memory_pool.misses == misses
+    np.testing.assert_array_equal(prepared.get_arguments()[0], np.full(4, 6.0))
+
+
+def test_rebind_on_an_idle_runtime_reuses_the_bound_memory(runtime, kernel, calls):
+    prepared = kernel.prepare(runtime, np.zeros(4, np.float32), 1.0)
+    memory = prepared.arguments[0].memory
+    calls.clear()
+
+    prepared.launch(np.arange(4, dtype=np.float32), 2.0)
+
+    assert prepared.arguments[0].memory is memory
+    assert _trace(calls) == ['ti_map_memory', 'ti_launch_kernel']
+
+
+def test_rebind_patches_scalars_without_uploading(runtime, kernel, calls):
+    prepared = kernel.prepare(runtime, np.ones(4, np.float32), 2.0)
+    memory = prepared.arguments[0].memory
+    calls.clear()
+
+    prepared.launch(None, 5.0)
+
+    assert _trace(calls) == ['ti_launch_kernel']
+    assert prepared.arguments[0].memory is memory
+    assert prepared.arguments[1].og == 5.0
+    np.testing.assert_array_equal(prepared.get_arguments()[0], [5, 5, 5, 5])
+
+
+def test_rebind_rebuilds_arguments_whose_layout_changed(runtime, kernel):
+    prepared = kernel.prepare(runtime, np.ones(4, np.float32), 2.0)
+    prepared.launch()
+    old_memory = prepared.arguments[0].memory
+
+    prepared.launch(np.ones(6, np.float32), 2.0)
+
+    assert prepared.arguments[0].memory is not old_memory
+    np.testing.assert_array_equal(prepared.get_arguments()[0], np.full(6, 2.0))
+    # The old argument goes back to the pool once the runtime is idle.
+    assert runtime.memory_pool.stats()['idle_blocks'] == 1
+
+
+def test_rebind_device_arrays(runtime, kernel, calls):
+    first = DeviceNdArray.from_numpy(runtime, np.ones(4, np.float32))
+    second = DeviceNdArray.from_numpy(runtime, np.full(4, 2.0, np.float32))
+    prepared = kernel.prepare(runtime, first, 3.0)
+    prepared.launch()
+    calls.clear()
+
+    prepared.launch(second, 3.0)
+
+    assert 'ti_wait' not in calls
+    np.testing.assert_array_equal(second.to_numpy(), np.full(4, 6.0))
+
+
+def test_bind_rejects_extra_arguments(runtime, kernel):
+    prepared = kernel.prepare(runtime, np.ones(4, np.float32), 2.0)
+
+    with pytest.raises(ValueError):
+        prepared.bind(np.ones(4, np.float32), 2.0, 3.0)
+
+
+def test_runtime_is_idle_until_a_launch_is_recorded(runtime, kernel):
+    assert runtime.idle
+
+    kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+    assert not runtime.idle
+
+    runtime.wait()
+    assert runtime.idle
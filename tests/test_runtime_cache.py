@@ -0,0 +1,73 @@
+import threading
+
+from taichiAOT.c_api import TiArch
+from taichiAOT.interfaces import RuntimeCache
+
+
+def test_acquire_shares_one_runtime(backend):
+    cache = RuntimeCache(ttl=60.0)
+
+    first = cache.acquire(TiArch.TI_ARCH_X64)
+    second = cache.acquire(TiArch.TI_ARCH_X64)
+
+    assert first is second
+    assert cache.stats() == {'runtimes': 1, 'idle': 0, 'references': 2}
+    cache.release(first)
+    cache.release(second)
+    cache.clear()
+
+
+def test_released_runtime_stays_warm_until_evicted(backend):
+    cache = RuntimeCache(ttl=60.0)
+    runtime = cache.acquire(TiArch.TI_ARCH_X64)
+
+    cache.release(runtime)
+
+    assert cache.stats()['idle'] == 1
+    assert cache.acquire(TiArch.TI_ARCH_X64) is runtime
+    cache.release(runtime)
+
+    cache.clear()
+    assert cache.stats()['runtimes'] == 0
+    assert runtime.arch is None
+
+
+def test_release_without_ttl_destroys_the_runtime(backend):
+    cache = RuntimeCache(ttl=0.0)
+    runtime = cache.acquire(TiArch.TI_ARCH_X64)
+
+    cache.release(runtime)
+
+    assert runtime.arch is None
+    assert cache.acquire(TiArch.TI_ARCH_X64) is not runtime
+    cache.clear()
+
+
+def test_concurrent_acquires_never_get_a_destroyed_runtime(backend):
+    cache = RuntimeCache(ttl=0.0)
+    errors = []
+
+    def work():
+        for _ in range(200):
+            runtime = cache.acquire(TiArch.TI_ARCH_X64)
+            if runtime.arch is None:
+                errors.append(runtime)
+            cache.release(runtime)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert cache.stats() == {'runtimes': 0, 'idle': 0, 'references': 0}
+
+
+def test_destroy_forgets_a_cached_runtime(backend):
+    cache = RuntimeCache(ttl=60.0)
+    runtime = cache.acquire(TiArch.TI_ARCH_X64)
+
+    runtime.destroy()
+
+    assert cache.stats()['runtimes'] == 0
@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+import pytest
+
+from taichiAOT.c_api import TiArch
+from taichiAOT.interfaces import RuntimeExecutor
+
+
+@pytest.fixture
+def executor(backend):
+    backend.register_kernel('scale', lambda x, k: x.__imul__(k))
+    with RuntimeExecutor(TiArch.TI_ARCH_X64) as executor:
+        yield executor
+
+
+def test_jobs_run_on_the_owner_thread(executor):
+    thread_name = executor.submit(lambda ti_runtime: threading.current_thread().name).result()
+
+    assert thread_name == 'taichi-runtime-owner-0'
+
+
+def test_launch_and_read_back(executor, module_path):
+    aot_module = executor.load_module(module_path).result()
+    kernel = aot_module.get_kernel('scale')
+
+    result = executor.launch_and_read_back(kernel, np.arange(4, dtype=np.float32), 2.0)
+
+    np.testing.assert_array_equal(result.result()[0], [0, 2, 4, 6])
+
+
+def test_device_arrays_stay_on_the_owner_runtime(executor, module_path):
+    aot_module = executor.load_module(module_path).result()
+    kernel = aot_module.get_kernel('scale')
+    device_array = executor.upload(np.ones(4, np.float32)).result()
+
+    executor.launch(kernel, device_array, 3.0)
+    host_array = executor.read_back(device_array).result()
+    executor.release(device_array).result()
+
+    np.testing.assert_array_equal(host_array, np.full(4, 3.0))
+    assert device_array.memory is None
+
+
+def test_queued_jobs_are_flushed_as_one_batch(backend, executor, calls):
+    running, gate = threading.Event(), threading.Event()
+    executor.submit(lambda ti_runtime: running.set() or gate.wait())
+    running.wait()
+    futures = [executor.submit(lambda ti_runtime: ti_runtime.record_launch())
+               for _ in range(3)]
+    gate.set()
+
+    for future in futures:
+        future.result()
+
+    assert calls.count('ti_flush') == 1
+
+
+def test_job_errors_resolve_only_their_future(executor):
+    def fail(ti_runtime):
+        raise ValueError('job failed')
+
+    failed = executor.submit(fail)
+    succeeded = executor.submit(lambda ti_runtime: 42)
+
+    with pytest.raises(ValueError, match='job failed'):
+        failed.result()
+    assert succeeded.result() == 42
+
+
+def test_submit_after_shutdown_is_rejected(backend):
+    executor = RuntimeExecutor(TiArch.TI_ARCH_X64)
+    executor.shutdown()
+
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda ti_runtime: None)
@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+import pytest
+
+from taichiAOT.c_api.simulated_backend import SimulatedBackend
+
+
+def _init_worker(latency: float) -> None:
+    from taichiAOT._utils import use_simulated_backend
+
+    backend = use_simulated_backend(SimulatedBackend())
+    backend.register_kernel('scale', lambda x, k: x.__imul__(k))
+    backend.set_latency('ti_launch_kernel', latency)
+
+
+@pytest.fixture
+def pool_factory(module_path):
+    from taichiAOT.interfaces import RuntimePool
+
+    pools = []
+
+    def create(**kwargs):
+        kwargs.setdefault('initializer', _init_worker)
+        kwargs.setdefault('initargs', (0.0,))
+        pool = RuntimePool(module_path, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield create
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_launch_returns_the_read_back_arrays(pool_factory):
+    pool = pool_factory(processes=2)
+    array = np.arange(8, dtype=np.float32)
+
+    futures = pool.map('scale', [(array, 2.0), (array, 3.0)])
+
+    np.testing.assert_array_equal(futures[0].result(timeout=30)[0], array * 2)
+    np.testing.assert_array_equal(futures[1].result(timeout=30)[0], array * 3)
+
+
+def test_dead_worker_fails_its_launches(pool_factory):
+    pool = pool_factory(processes=2, initargs=(0.5,))
+    array = np.ones(4, np.float32)
+    futures = [pool.launch('scale', array, 2.0) for _ in range(4)]
+
+    time.sleep(0.2)
+    pool._processes[0].kill()
+
+    errors = 0
+    for future in futures:
+        try:
+            np.testing.assert_array_equal(future.result(timeout=30)[0], array * 2)
+        except RuntimeError:
+            errors += 1
+
+    assert errors == 2
+    np.testing.assert_array_equal(pool.launch('scale', array, 3.0).result(timeout=30)[0],
+                                  array * 3)
+
+
+def test_startup_times_out(module_path):
+    from taichiAOT.interfaces import RuntimePool
+
+    with pytest.raises(RuntimeError, match='Timed out'):
+        RuntimePool(module_path, processes=1, initializer=time.sleep, initargs=(30,),
+                    startup_timeout=0.5)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from taichiAOT._utils import get_last_error, set_last_error
+from taichiAOT.c_api import *
+from taichiAOT.c_api import C
+from taichiAOT.c_api.simulated_backend import SimulatedBackend
+from taichiAOT.interfaces import Memory
+
+
+def _allocate(runtime, size: int) -> Memory:
+    return Memory.allocate(runtime, TiMemoryAllocateInfo(
+        size=size, host_write=TI_TRUE, host_read=TI_TRUE, export_sharing=TI_FALSE,
+        usage=TiMemoryUsageFlags.TI_MEMORY_USAGE_STORAGE_BIT))
+
+
+def test_calls_are_routed_to_the_backend(backend):
+    assert C.backend is backend
+    assert ti_get_version() == 10600
+
+
+def test_memory_is_backed_by_host_arrays(backend, runtime):
+    memory = _allocate(runtime, 16)
+
+    with memory.as_numpy(np.int32) as data:
+        data[:] = [1, 2, 3, 4]
+
+    np.testing.assert_array_equal(backend.memory_array(memory.memory_instance).view(np.int32),
+                                  [1, 2, 3, 4])
+    memory.free()
+
+
+def test_device_to_device_copies_move_bytes(runtime):
+    source, destination = _allocate(runtime, 8), _allocate(runtime, 8)
+    with source.as_numpy(np.uint8) as data:
+        data[:] = np.arange(8)
+
+    ti_copy_memory_device_to_device(runtime.runtime_instance,
+                                    source.slice(2, 4), destination.slice(0, 4))
+
+    np.testing.assert_array_equal(destination.numpy_view(np.uint8)[:4], [2, 3, 4, 5])
+
+
+def test_launches_are_recorded_and_run(backend, runtime, kernel):
+    kernel.launch(runtime, np.ones(3, np.float32), 2.0)
+
+    assert backend.launch_count == 1
+    assert backend.launches[-1].name == 'scale'
+    assert backend.launches[-1].arguments == (((3,), np.dtype(np.float32)), 2.0)
+
+
+def test_errors_are_reported_per_thread(backend, runtime):
+    set_last_error(TiError.TI_ERROR_INVALID_STATE, "broken")
+
+    with pytest.raises(RuntimeError, match='broken'):
+        get_last_error()
+
+    set_last_error(TiError.TI_ERROR_SUCCESS, "")
+    get_last_error()
+
+
+def test_latency_is_applied_per_function(backend):
+    backend.set_latency('ti_get_version', 0.01)
+
+    from time import perf_counter
+    start = perf_counter()
+    ti_get_version()
+
+    assert perf_counter() - start >= 0.01
+
+
+def test_environment_selects_the_backend(monkeypatch):
+    from taichiAOT.c_api._api_loader import C_API
+
+    monkeypatch.setenv(C_API.BACKEND_ENV, 'simulated')
+    api = C_API()
+
+    assert api.ti_get_version() == 10600
+    assert isinstance(api.backend, SimulatedBackend)
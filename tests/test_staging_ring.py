@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from taichiAOT.interfaces import DeviceNdArray
+
+
+@pytest.fixture
+def staged_runtime(runtime):
+    runtime.upload_mode = 'staged'
+    return runtime
+
+
+def test_staged_arrays_are_device_local(staged_runtime):
+    array = np.arange(100, dtype=np.float32)
+
+    device_array = DeviceNdArray.from_numpy(staged_runtime, array)
+
+    assert not device_array.memory.host_visible
+    np.testing.assert_array_equal(device_array.to_numpy(), array)
+
+
+def test_transfers_are_chunked_through_the_ring(staged_runtime, calls):
+    staged_runtime.staging_ring.chunk_size = 1024
+    array = np.asfortranarray(np.arange(3000, dtype=np.float64).reshape(100, 30))
+
+    device_array = DeviceNdArray.from_numpy(staged_runtime, array)
+    out = np.empty_like(array)
+
+    assert device_array.memory.read(array.dtype, array.shape, out=out) is out
+    np.testing.assert_array_equal(out, array)
+    assert calls.count('ti_copy_memory_device_to_device') == 2 * -(-array.nbytes // 1024)
+
+
+def test_ring_waits_before_reusing_a_pending_buffer(staged_runtime, calls):
+    ring = staged_runtime.staging_ring
+    memory = DeviceNdArray.empty(staged_runtime, (4,), np.float32).memory
+    calls.clear()
+
+    for value in range(len(ring._slots) + 1):
+        memory.write(np.full(4, value, np.float32))
+
+    assert calls.count('ti_wait') == 1
+    np.testing.assert_array_equal(memory.read(np.float32, (4,)), np.full(4, len(ring._slots)))
+
+
+def test_unknown_upload_mode_is_rejected(runtime):
+    with pytest.raises(ValueError):
+        runtime.upload_mode = 'mapped'
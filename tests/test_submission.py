@@ -0,0 +1,60 @@
+import numpy as np
+
+from taichiAOT.interfaces import SubmissionPolicy
+
+
+def _submissions(calls):
+    return [name for name in calls if name in ('ti_flush', 'ti_wait')]
+
+
+def test_batch_flushes_once_when_the_outermost_scope_exits(runtime, kernel, calls):
+    runtime.submission_policy = SubmissionPolicy(flush_every=1)
+
+    with runtime.batch():
+        for _ in range(3):
+            kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+        with runtime.batch():
+            kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+        assert _submissions(calls) == []
+
+    assert _submissions(calls) == ['ti_flush']
+
+
+def test_empty_batch_does_not_flush(runtime, calls):
+    with runtime.batch():
+        pass
+
+    assert _submissions(calls) == []
+
+
+def test_flush_every_flushes_after_that_many_launches(runtime, kernel, calls):
+    runtime.submission_policy = SubmissionPolicy(flush_every=2)
+
+    for _ in range(5):
+        kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+
+    assert _submissions(calls) == ['ti_flush', 'ti_flush']
+
+
+def test_flush_interval_flushes_once_it_elapsed(runtime, kernel, calls):
+    runtime.submission_policy = SubmissionPolicy(flush_interval_ms=1e-6)
+
+    kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+
+    assert _submissions(calls) == ['ti_flush']
+
+
+def test_default_policy_never_flushes_on_its_own(runtime, kernel, calls):
+    for _ in range(10):
+        kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+
+    assert _submissions(calls) == []
+
+
+def test_should_flush():
+    policy = SubmissionPolicy(flush_every=4, flush_interval_ms=10.0)
+
+    assert not policy.should_flush(3, 9.0)
+    assert policy.should_flush(4, 0.0)
+    assert policy.should_flush(1, 10.0)
+    assert not SubmissionPolicy().should_flush(1000, 1e9)
@@ -0,0 +1,93 @@
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from taichiAOT.tracing import Tracer, tracer
+
+
+@pytest.fixture
+def tracing(backend):
+    tracer.clear()
+    tracer.enable()
+    yield tracer
+    tracer.disable()
+    tracer.clear()
+
+
+def test_c_calls_and_launches_are_traced(runtime, kernel, tracing):
+    kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+    runtime.wait()
+
+    events = tracing.to_chrome_trace()['traceEvents']
+    names = [event['name'] for event in events if event['ph'] == 'X']
+
+    assert 'ti_launch_kernel' in names
+    assert 'ti_wait' in names
+    assert 'scale' in names
+    assert any(event['ph'] == 'M' and event['args']['name'] == threading.current_thread().name
+               for event in events)
+
+
+def test_disabled_tracer_records_nothing(runtime, kernel):
+    tracer.clear()
+
+    kernel.launch(runtime, np.ones(4, np.float32), 2.0)
+
+    assert len(tracer) == 0
+
+
+def test_ring_buffer_drops_the_oldest_spans():
+    ring = Tracer(capacity=2)
+
+    for index in range(3):
+        ring.record(f'span{index}', 'test', index, index + 1)
+
+    names = [event['name'] for event in ring.to_chrome_trace()['traceEvents']
+             if event['ph'] == 'X']
+    assert names == ['span1', 'span2']
+
+
+def test_spans_are_in_microseconds():
+    ring = Tracer()
+    ring.record('span', 'test', 1000, 3500, nbytes=4)
+
+    event = ring.to_chrome_trace()['traceEvents'][-1]
+
+    assert (event['ts'], event['dur']) == (1.0, 2.5)
+    assert event['args'] == {'nbytes': 4}
+
+
+def test_recording_from_threads_while_exporting():
+    ring = Tracer(capacity=256)
+    stop = threading.Event()
+
+    def record():
+        while not stop.is_set():
+            ring.record('span', 'test', 0, 1)
+
+    threads = [threading.Thread(target=record, name=f'recorder-{index}') for index in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(20):
+            ring.to_chrome_trace()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    thread_names = {event['args']['name'] for event in ring.to_chrome_trace()['traceEvents']
+                    if event['ph'] == 'M'}
+    assert thread_names == {thread.name for thread in threads}
+
+
+def test_dump_writes_a_chrome_trace(tmp_path):
+    ring = Tracer()
+    ring.record('span', 'test', 0, 1000)
+
+    ring.dump(str(tmp_path / 'trace.json'))
+
+    with open(tmp_path / 'trace.json') as file:
+        assert json.load(file)['displayTimeUnit'] == 'ms'
@@ -0,0 +1,114 @@
+"""Timeline tracing of C calls and binding operations.
+
+Once enabled, every Taichi C-API call and the instrumented operations of
+the `interfaces` layer (launches, uploads, readbacks, flushes and waits)
+are recorded as begin/end spans in a bounded ring buffer, which can be
+dumped in the Chrome Trace Event format and opened in Perfetto or
+`chrome://tracing`.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, Optional, Tuple
+
+
+class Tracer:
+    """A ring buffer of timed spans, the oldest dropped first."""
+
+    def __init__(self, capacity: int = 65536):
+        self.enabled: bool = False
+        self._lock = Lock()
+        self._events: Deque[Tuple] = deque(maxlen=capacity)
+        self._thread_names: Dict[int, str] = {}
+
+    @property
+    def capacity(self) -> int:
+        return self._events.maxlen
+
+    def enable(self, capacity: Optional[int] = None) -> None:
+        """Starts recording, optionally resizing the ring buffer."""
+
+        from .c_api.c_ti_methods import C
+
+        if capacity is not None and capacity != self._events.maxlen:
+            with self._lock:
+                self._events = deque(self._events, maxlen=capacity)
+
+        self.enabled = True
+        C.add_call_hook(self._record_c_call)
+
+    def disable(self) -> None:
+        """Stops recording. Recorded spans are kept until :meth:`clear`."""
+
+        from .c_api.c_ti_methods import C
+
+        self.enabled = False
+        C.remove_call_hook(self._record_c_call)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+    def record(self, name: str, category: str, start_ns: int, end_ns: int,
+               **args) -> None:
+        """Records a span of the calling thread between two
+        `perf_counter_ns` timestamps."""
+
+        thread_id = threading.get_ident()
+
+        with self._lock:
+            if thread_id not in self._thread_names:
+                self._thread_names[thread_id] = threading.current_thread().name
+
+            self._events.append((name, category, start_ns, end_ns, thread_id, args))
+
+    def _record_c_call(self, method_name: str, start_ns: int, end_ns: int) -> None:
+        self.record(method_name, 'c_api', start_ns, end_ns)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def to_chrome_trace(self) -> dict:
+        """Converts the recorded spans to a Chrome Trace Event document."""
+
+        process_id = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            thread_names = list(self._thread_names.items())
+
+        trace_events = [{
+            'name': 'thread_name',
+            'ph': 'M',
+            'pid': process_id,
+            'tid': thread_id,
+            'args': {'name': thread_name},
+        } for thread_id, thread_name in thread_names]
+
+        for name, category, start_ns, end_ns, thread_id, args in events:
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': start_ns / 1000.0,
+                'dur': (end_ns - start_ns) / 1000.0,
+                'pid': process_id,
+                'tid': thread_id,
+            }
+            if args:
+                event['args'] = args
+
+            trace_events.append(event)
+
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, filepath: str) -> None:
+        """Writes the recorded spans to a Chrome Trace Event JSON file."""
+
+        with open(filepath, 'w') as file:
+            json.dump(self.to_chrome_trace(), file)
+
+
+tracer = Tracer()